@@ -6,10 +6,11 @@ import dash_bootstrap_components as dbc
 import os, stat, pwd, grp
 from urllib.parse import urlparse, unquote
 
-from .accounting_db import db  # ← IMPORT db, do not create it here
-from .services.entities import get_entities
+from sqlalchemy.engine import make_url
+
+from .accounting_db import db, configure_database, init_report_engine, init_sqlite_engine  # ← IMPORT db, do not create it here
+from .services.entities import SESSION_ENTITY_KEY, get_entities
 
-SESSION_ENTITY_KEY = "current_entity"
 DEFAULT_ENTITY = "JAJG Pty Ltd"
 
 def uri_to_path(db_uri: str) -> str:
@@ -54,29 +55,33 @@ def ensure_entity():
 def inject_entity():
     return {
         "current_entity": session.get(SESSION_ENTITY_KEY),
-        "all_entities": get_entities(),  # reuse your existing service
+        "all_entities": get_entities(),  # cached registry (services.entities), no query per render
     }
 
+# FLASK_SQLALCHEMY_DATABASE_URI (e.g. postgresql+psycopg://...) wins; otherwise the local SQLite file
 # Mac version
 if ('LOCAL' in app.config) and app.config['LOCAL']:
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:////Users/gary/.local/accounting/accounting.db"
+    configure_database(app, "sqlite:////Users/gary/.local/accounting/accounting.db")
 #Google Cloud version
 else:
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:////var/www/FlaskApp/instance/accounting.db"
+    configure_database(app, "sqlite:////var/www/FlaskApp/instance/accounting.db")
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
-print(app.config["SQLALCHEMY_DATABASE_URI"])
-print_perms(app.config["SQLALCHEMY_DATABASE_URI"])
-print_perms(os.path.dirname(app.config["SQLALCHEMY_DATABASE_URI"]))
+print(make_url(app.config["SQLALCHEMY_DATABASE_URI"]).render_as_string(hide_password=True))
+if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite:"):
+    print_perms(app.config["SQLALCHEMY_DATABASE_URI"])
+    print_perms(os.path.dirname(app.config["SQLALCHEMY_DATABASE_URI"]))
 
 app.config["API_DEBUG"] = True
 
 # Initialise extensions
 db.init_app(app)
+init_sqlite_engine(app)  # WAL + pragmas on every connection (SQLITE_* config)
+init_report_engine(app)  # separate read-only engine for reports (report_session)
 migrate = Migrate(app, db)
 
 # Import models so Alembic sees them
-from .models import entity, account, transaction, transaction_line, csv_account_mapping  # ← IMPORTANT
+from .models import entity, account, transaction, transaction_line, csv_account_mapping, account_daily_balance, payee_account_count, transaction_number_sequence, transaction_search  # ← IMPORTANT
 
 from .routes.transactions_api import bp as transactions_api_bp
 from .routes.accounts_api import bp as accounts_api_bp
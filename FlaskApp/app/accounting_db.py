@@ -1,4 +1,158 @@
+from flask import current_app, g
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
 
 db = SQLAlchemy()
 
+
+def report_session() -> Session:
+    """
+    Session for report reads (P&L, Balance Sheet, account list/ledger, GL export).
+
+    One per app context on the read-only report engine (see init_report_engine),
+    or db.session itself when there is none (scripts, in-memory databases).
+    """
+    engine = current_app.extensions.get("report_engine")
+    if engine is None:
+        return db.session
+    sess = g.get("_report_session")
+    if sess is None:
+        sess = g._report_session = Session(bind=engine, autoflush=False)
+    return sess
+
+
+# Per-connection SQLite settings, overridable through app config (or FLASK_SQLITE_* env vars).
+# WAL lets the Dash/report readers keep reading while an import is writing, and the
+# busy timeout makes a second writer wait for the lock instead of failing with
+# "database is locked".
+SQLITE_PRAGMA_DEFAULTS = {
+    "SQLITE_JOURNAL_MODE": "WAL",
+    "SQLITE_SYNCHRONOUS": "NORMAL",      # safe with WAL; fsync at checkpoints only
+    "SQLITE_CACHE_SIZE": -64000,         # negative = KiB, i.e. ~64 MB page cache
+    "SQLITE_MMAP_SIZE": 256 * 1024 * 1024,
+    "SQLITE_TEMP_STORE": "MEMORY",
+    "SQLITE_BUSY_TIMEOUT_MS": 15000,
+}
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+# Connection pool for server databases (PostgreSQL), overridable through app config.
+# SQLite keeps SQLAlchemy's default pool: there is a single writer either way.
+DB_POOL_DEFAULTS = {
+    "DB_POOL_SIZE": 10,
+    "DB_MAX_OVERFLOW": 20,
+    "DB_POOL_TIMEOUT": 30,       # seconds to wait for a free connection
+    "DB_POOL_RECYCLE": 1800,     # reconnect before server/proxy idle timeouts
+}
+
+
+def pool_options(config) -> dict:
+    """create_engine() pool arguments for a non-SQLite database."""
+    cfg = {k: config.get(k, default) for k, default in DB_POOL_DEFAULTS.items()}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": int(cfg["DB_POOL_SIZE"]),
+        "max_overflow": int(cfg["DB_MAX_OVERFLOW"]),
+        "pool_timeout": int(cfg["DB_POOL_TIMEOUT"]),
+        "pool_recycle": int(cfg["DB_POOL_RECYCLE"]),
+    }
+
+
+def configure_database(app, default_uri: str) -> None:
+    """
+    Choose the database: SQLALCHEMY_DATABASE_URI from the config (e.g. the
+    FLASK_SQLALCHEMY_DATABASE_URI env var, "postgresql+psycopg://..."), else
+    `default_uri`. Non-SQLite databases get pooled connections (DB_POOL_*), unless
+    SQLALCHEMY_ENGINE_OPTIONS is set explicitly. Call before db.init_app(app).
+    """
+    uri = app.config.get("SQLALCHEMY_DATABASE_URI") or default_uri
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    if make_url(uri).get_backend_name() != "sqlite":
+        app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", pool_options(app.config))
+
+
+def _choice(value, allowed, name):
+    value = str(value).strip().upper()
+    if value not in allowed:
+        raise ValueError(f"{name} must be one of {sorted(allowed)}, got {value!r}")
+    return value
+
+
+def sqlite_pragmas(config) -> list:
+    """PRAGMA statements for an app config (validated, so they are safe to inline)."""
+    cfg = {k: config.get(k, default) for k, default in SQLITE_PRAGMA_DEFAULTS.items()}
+    return [
+        f"PRAGMA journal_mode={_choice(cfg['SQLITE_JOURNAL_MODE'], _JOURNAL_MODES, 'SQLITE_JOURNAL_MODE')}",
+        f"PRAGMA synchronous={_choice(cfg['SQLITE_SYNCHRONOUS'], _SYNCHRONOUS, 'SQLITE_SYNCHRONOUS')}",
+        f"PRAGMA cache_size={int(cfg['SQLITE_CACHE_SIZE'])}",
+        f"PRAGMA mmap_size={int(cfg['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA temp_store={_choice(cfg['SQLITE_TEMP_STORE'], _TEMP_STORES, 'SQLITE_TEMP_STORE')}",
+        f"PRAGMA busy_timeout={int(cfg['SQLITE_BUSY_TIMEOUT_MS'])}",
+    ]
+
+
+def _on_connect_execute(statements):
+    def _on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for stmt in statements:
+                cur.execute(stmt)
+        finally:
+            cur.close()
+    return _on_connect
+
+
+def init_sqlite_engine(app) -> None:
+    """Apply the SQLITE_* pragmas to every new connection of the app's SQLite engines.
+
+    Call after db.init_app(app). Non-SQLite engines are left untouched.
+    """
+    on_connect = _on_connect_execute(sqlite_pragmas(app.config))
+
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", on_connect)
+
+
+def init_report_engine(app) -> None:
+    """Give report_session its own engine (REPORTS_DATABASE_URI, default the main database).
+
+    Call after db.init_app(app). The report engine has a separate connection pool,
+    and on SQLite every connection gets the SQLITE_* pragmas plus query_only=ON, so
+    a report can never take the write lock; on PostgreSQL its transactions are READ
+    ONLY. In-memory SQLite databases cannot be shared between engines;
+    report_session() then returns db.session.
+    """
+    if app.config.get("REPORTS_DATABASE_URI"):
+        url = make_url(app.config["REPORTS_DATABASE_URI"])
+    else:
+        # The main engine's URL, not the config string: Flask-SQLAlchemy resolves a
+        # relative SQLite path against app.instance_path, create_engine against the cwd
+        with app.app_context():
+            url = db.engines[None].url
+
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return
+        engine = create_engine(url)
+        event.listen(engine, "connect", _on_connect_execute(sqlite_pragmas(app.config) + ["PRAGMA query_only=ON"]))
+    else:
+        engine = create_engine(url, **pool_options(app.config))
+        if url.get_backend_name() == "postgresql":
+            engine = engine.execution_options(postgresql_readonly=True)
+
+    app.extensions["report_engine"] = engine
+
+    @app.teardown_appcontext
+    def _close_report_session(exc=None):
+        sess = g.pop("_report_session", None)
+        if sess is not None:
+            sess.close()
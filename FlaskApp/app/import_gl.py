@@ -1,7 +1,11 @@
 import pandas as pd
 from FlaskApp.app import app, db
-from FlaskApp.app.accounting_db import Entity, Account, Transaction, TransactionLine
+from FlaskApp.app.accounting_db import Entity, Account
 import FlaskApp.app.common as common
+from FlaskApp.app.services.account_balances import rebuild_account_balances
+from FlaskApp.app.services.bulk_import import ImportLine, ImportTransaction, bulk_insert_transactions
+from FlaskApp.app.services.payee_suggestions import rebuild_payee_index
+from FlaskApp.app.services.report_cache import bump_ledger_version
 import os
 
 def lookup_account_id(name):
@@ -20,40 +24,48 @@ def import_gl(entity):
    # Load your parsed GL file
     df = pd.read_csv("FlaskApp/app/assets/General_ledger.csv")
 
-    # Iterate over unique transaction_ids
+    # Account name -> id, loaded once instead of one query per GL row
+    account_ids = {}
+    for account in Account.query.order_by(Account.id).all():
+        account_ids.setdefault(account.name, account.id)
+
+    def account_id_for(name):
+        if name not in account_ids:
+            account_ids[name] = lookup_account_id(name)
+        return account_ids[name]
+
+    # Build every transaction in memory, then insert them in bulk
+    txns = []
     for txn_id, group in df.groupby("transaction_id"):
         if txn_id == "check":  # skip unmatched rows
             continue
 
-        # Create Transaction record
-        txn = Transaction(
-            entity_id=entity,  # replace with actual entity_id
+        txn = ImportTransaction(
             transaction_id=str(txn_id),
             date=pd.to_datetime(group["Date"].iloc[0]).date(),
             description=group["Memo/Description"].iloc[0],
             transaction_type=group["Transaction Type"].iloc[0],
         )
-        db.session.add(txn)
-        db.session.flush()  # ensures txn.id is available
 
-        # Create TransactionLine entries for each row in this transaction
+        # One line per row: debit vs credit based on which column is nonzero
         for _, row in group.iterrows():
-            # Example: decide debit vs credit based on which column is nonzero
             if row["Debit"] > 0:
-                line = TransactionLine(
-                    transaction_id=txn.id,
-                    account_id=lookup_account_id(row["Account"]),  # implement lookup
-                    is_debit=True,
-                    amount=row["Debit"],
-                )
-            if row["Credit"] > 0:
-                line = TransactionLine(
-                    transaction_id=txn.id,
-                    account_id=lookup_account_id(row["Account"]),
-                    is_debit=False,
-                    amount=row["Credit"],
-                )
-            db.session.add(line)
+                txn.lines.append(ImportLine(account_id=account_id_for(row["Account"]), is_debit=True, amount=float(row["Debit"])))
+            elif row["Credit"] > 0:
+                txn.lines.append(ImportLine(account_id=account_id_for(row["Account"]), is_debit=False, amount=float(row["Credit"])))
+
+        txns.append(txn)
+
+    bulk_insert_transactions(
+        entity,
+        txns,
+        progress=lambda done, total: common.logger.debug(f"GL import: {done}/{total} transactions"),
+    )
+
+    db.session.flush()
+    rebuild_account_balances(entity)
+    rebuild_payee_index(entity)
+    bump_ledger_version(entity)
 
     # Commit all inserts
     db.session.commit()
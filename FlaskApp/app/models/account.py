@@ -12,6 +12,7 @@ class Account(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("name", "type", name="_account_name_type_uc"),
+        db.Index("ix_accounts_entity_type", "entity_id", "type"),
     )
 
     entity = db.relationship(
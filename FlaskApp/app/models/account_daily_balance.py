@@ -0,0 +1,30 @@
+# FlaskApp/app/models/account_daily_balance.py
+
+from FlaskApp.app.accounting_db import db
+
+
+class AccountDailyBalance(db.Model):
+    """Cumulative closing balance of an account at the end of a day with activity.
+
+    One row per (entity, account, date) on which the account had postings.
+    `balance_cents` is debit-positive / credit-negative (sum(debits) - sum(credits),
+    in integer cents) for all transactions up to and including `date`, so the as-of
+    balance for any date is simply the latest row <= that date.
+
+    Rows are maintained by services.account_balances whenever transactions are
+    written; never edit them by hand.
+    """
+
+    __tablename__ = "account_daily_balances"
+    __table_args__ = (
+        db.UniqueConstraint("entity_id", "account_id", "date", name="uq_entity_account_date_balance"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    entity_id = db.Column(db.Integer, db.ForeignKey("entities.id"), nullable=False)
+    account_id = db.Column(db.Integer, db.ForeignKey("accounts.id"), nullable=False)
+
+    date = db.Column(db.Date, nullable=False)
+
+    balance_cents = db.Column(db.BigInteger, nullable=False, default=0)
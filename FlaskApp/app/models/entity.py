@@ -8,6 +8,12 @@ class Entity(db.Model):
     type = db.Column(db.String(50))  # company, trust, etc.
     description = db.Column(db.String(250))
 
+    # Bumped by every transaction write; tags cached reports (services.report_cache)
+    ledger_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    # Bumped whenever one of its accounts changes; tags cached hierarchies (services.account_hierarchy)
+    accounts_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     __table_args__ = (
         db.UniqueConstraint("name", "type", name="_name_type_uc"),
     )
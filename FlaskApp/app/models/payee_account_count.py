@@ -0,0 +1,29 @@
+# FlaskApp/app/models/payee_account_count.py
+
+from FlaskApp.app.accounting_db import db
+
+
+class PayeeAccountCount(db.Model):
+    """How often an account appears on transactions whose description contains a token.
+
+    One row per (entity, normalized description token, account): `count` is the
+    number of transaction lines on that account across the entity's transactions
+    whose description contains the token. Used to suggest the counterparty account
+    for imported CSV rows from their payee.
+
+    Rows are maintained by services.payee_suggestions whenever transactions are
+    written; never edit them by hand.
+    """
+
+    __tablename__ = "payee_account_counts"
+    __table_args__ = (
+        db.UniqueConstraint("entity_id", "token", "account_id", name="uq_entity_token_account"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    entity_id = db.Column(db.Integer, db.ForeignKey("entities.id"), nullable=False)
+    token = db.Column(db.String(64), nullable=False)
+    account_id = db.Column(db.Integer, db.ForeignKey("accounts.id"), nullable=False)
+
+    count = db.Column(db.Integer, nullable=False, default=0)
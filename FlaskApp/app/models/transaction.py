@@ -8,6 +8,8 @@ class Transaction(db.Model):
     __tablename__ = "transactions"
     __table_args__ = (
         db.UniqueConstraint("entity_id", "transaction_id", name="uq_entity_transaction_id"),
+        # Report / ledger shape: WHERE entity_id = ? AND date BETWEEN ? AND ?, ordered by (date, id)
+        db.Index("ix_transactions_entity_date_id", "entity_id", "date", "id"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -1,16 +1,41 @@
 from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
 from FlaskApp.app.accounting_db import db
+from FlaskApp.app.utils.money import from_cents, to_cents
 
 class TransactionLine(db.Model):
     __tablename__ = 'transaction_lines'
+    __table_args__ = (
+        # Covering index for per-account aggregates (reports, account list, ledger):
+        # the SUM(CASE is_debit ...) is answered from the index without touching the table.
+        db.Index("ix_transaction_lines_account_txn_covering", "account_id", "transaction_id", "is_debit", "amount_cents"),
+        db.Index("ix_transaction_lines_transaction_id", "transaction_id"),
+        # Amount search: WHERE amount_cents = ? is an equality seek, then join by transaction_id
+        db.Index("ix_transaction_lines_amount_cents", "amount_cents", "transaction_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     transaction_id = db.Column(db.Integer, db.ForeignKey('transactions.id'), nullable=False)
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id'), nullable=False)
     is_debit = db.Column(db.Boolean, nullable=False)  # True = debit, False = credit
-    amount = db.Column(db.Float, nullable=False)
+    # Stored as integer cents; sum amount_cents in SQL and convert once with from_cents()
+    amount_cents = db.Column(db.BigInteger, nullable=False)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
 
     memo = db.Column(db.Text)  # ✅ NEW
 
+    @hybrid_property
+    def amount(self):
+        """Amount in dollars (float), for display/JSON and form input."""
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    @amount.expression
+    def amount(cls):
+        return cls.amount_cents / 100.0
+
@@ -0,0 +1,19 @@
+# FlaskApp/app/models/transaction_number_sequence.py
+
+from FlaskApp.app.accounting_db import db
+
+
+class TransactionNumberSequence(db.Model):
+    """Last transaction number (transactions.transaction_id) handed out for an entity.
+
+    One row per entity. Numbers are allocated by services.transaction_numbers with a
+    single UPDATE ... RETURNING on this row, which holds the row (SQLite: database)
+    write lock until the allocating transaction commits, so concurrent creates and
+    imports never get the same number.
+    """
+
+    __tablename__ = "transaction_number_sequences"
+
+    entity_id = db.Column(db.Integer, db.ForeignKey("entities.id"), primary_key=True, autoincrement=False)
+
+    last_value = db.Column(db.Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,74 @@
+# FlaskApp/app/models/transaction_search.py
+
+from sqlalchemy import DDL, event
+
+from FlaskApp.app.accounting_db import db
+
+# SQLite FTS5 index over transaction descriptions and line memos (rowid = transactions.id),
+# kept in sync by triggers. Migration 2f6c8d1a7e93 creates it on migrated databases; the
+# DDL below does the same for databases built with db.create_all().
+TABLE_NAME = "transaction_search"
+
+_MEMOS = "coalesce((SELECT group_concat(memo, ' ') FROM transaction_lines WHERE transaction_id = {txn}), '')"
+
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transaction_search "
+    "USING fts5(description, memos, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+TRIGGERS = {
+    "transaction_search_txn_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS transaction_search_txn_ai AFTER INSERT ON transactions BEGIN
+            INSERT OR REPLACE INTO transaction_search (rowid, description, memos)
+            VALUES (new.id, coalesce(new.description, ''), {_MEMOS.format(txn="new.id")});
+        END
+    """,
+    "transaction_search_txn_au": """
+        CREATE TRIGGER IF NOT EXISTS transaction_search_txn_au AFTER UPDATE OF description ON transactions BEGIN
+            UPDATE transaction_search SET description = coalesce(new.description, '') WHERE rowid = new.id;
+        END
+    """,
+    "transaction_search_txn_ad": """
+        CREATE TRIGGER IF NOT EXISTS transaction_search_txn_ad AFTER DELETE ON transactions BEGIN
+            DELETE FROM transaction_search WHERE rowid = old.id;
+        END
+    """,
+    "transaction_search_line_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS transaction_search_line_ai AFTER INSERT ON transaction_lines
+        WHEN new.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_au": f"""
+        CREATE TRIGGER IF NOT EXISTS transaction_search_line_au AFTER UPDATE OF memo, transaction_id ON transaction_lines BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS transaction_search_line_ad AFTER DELETE ON transaction_lines
+        WHEN old.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+        END
+    """,
+}
+
+# Index transactions that are not in it yet (all of them on a fresh table)
+BACKFILL = f"""
+    INSERT INTO transaction_search (rowid, description, memos)
+    SELECT t.id, coalesce(t.description, ''), {_MEMOS.format(txn="t.id")}
+    FROM transactions t
+    WHERE t.id NOT IN (SELECT rowid FROM transaction_search)
+"""
+
+for _ddl in [CREATE_TABLE, *TRIGGERS.values(), BACKFILL]:
+    event.listen(db.metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+# drop_all() does not know the virtual table; drop it so a later create_all() starts clean
+for _name in TRIGGERS:
+    event.listen(db.metadata, "before_drop", DDL(f"DROP TRIGGER IF EXISTS {_name}").execute_if(dialect="sqlite"))
+event.listen(db.metadata, "before_drop", DDL("DROP TABLE IF EXISTS transaction_search").execute_if(dialect="sqlite"))
@@ -10,6 +10,7 @@ from FlaskApp.app.models.account import Account
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.utils.money import from_cents
 
 import FlaskApp.app.common as common
 
@@ -18,11 +19,11 @@ dash.register_page(__name__, path="/accounts")
 
 def _account_rows(entity_name: str, account_type: str | None):
     debit_sum = func.sum(
-        case((TransactionLine.is_debit == True, TransactionLine.amount), else_=0)
+        case((TransactionLine.is_debit == True, TransactionLine.amount_cents), else_=0)
     ).label("debit_total")
 
     credit_sum = func.sum(
-        case((TransactionLine.is_debit == False, TransactionLine.amount), else_=0)
+        case((TransactionLine.is_debit == False, TransactionLine.amount_cents), else_=0)
     ).label("credit_total")
 
     q = (
@@ -47,9 +48,9 @@ def _account_rows(entity_name: str, account_type: str | None):
 
     rows = []
     for r in q.all():
-        debit = float(r.debit_total or 0.0)
-        credit = float(r.credit_total or 0.0)
-        bal = debit - credit
+        debit = from_cents(r.debit_total)
+        credit = from_cents(r.credit_total)
+        bal = from_cents((r.debit_total or 0) - (r.credit_total or 0))
 
         rows.append(
             {
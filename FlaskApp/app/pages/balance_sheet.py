@@ -1,19 +1,14 @@
-import requests
 import dash
 from dash import html, dcc, Input, Output, State, callback, no_update
 from datetime import date, datetime
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import parse_qs
 from flask import session as flask_session
 
-import FlaskApp.app.common as common
+from FlaskApp.app.services.report_client import ReportClientError, get_balance_sheet, get_balance_sheet_xlsx
 
 dash.register_page(__name__, path="/balance-sheet")
 
 
-def API_TOKEN() -> str:
-    return common.access_secret_version("global_parameters", None, "api_token")
-
-
 AUD_ACCOUNTING_FMT = "_($* #,##0.00_);_($* (#,##0.00);_($* \"-\"??_);_(@_)"
 
 FISCAL_YEAR_START_MONTH = 7  # July
@@ -216,16 +211,13 @@ def sync_asof_from_url(search):
     return d, f"As of: {d.isoformat()}"
 
 
-def _build_query(asof: date, compare_prevfy: bool) -> tuple[str, str]:
+def _build_query(asof: date, compare_prevfy: bool) -> dict:
     """
-    Returns (json_url, xlsx_url) including query params.
+    Returns the report query params (as accepted by /api/reports/balance_sheet).
     c1 = previous FY end (Jun 30 of FY start year)
     c2 = as-of date, labelled as FY label (Jul YYYY - Jun YYYY)
     """
 
-    base_json = common.absolute_url(f"/api/reports/balance_sheet")
-    base_xlsx = common.absolute_url(f"/api/reports/balance_sheet.xlsx")
-
     if compare_prevfy:
         prev_end = _previous_fy_end(asof)
         params = {
@@ -245,8 +237,7 @@ def _build_query(asof: date, compare_prevfy: bool) -> tuple[str, str]:
     if entity_name:
         params["entity"] = entity_name
 
-    qs = urlencode(params)
-    return f"{base_json}?{qs}", f"{base_xlsx}?{qs}"
+    return params
 
 
 @callback(
@@ -264,27 +255,11 @@ def load_bs_preview(asof_date, compare_vals):
     asof = date.fromisoformat(asof_date)
     compare_prevfy = "on" in (compare_vals or [])
 
-    json_url, _ = _build_query(asof, compare_prevfy)
-
     try:
-        resp = requests.get(
-            json_url,
-            headers={"X-Internal-Token": API_TOKEN()},
-            verify=common.api_verify,
-            timeout=30,
-        )
-    except Exception as e:
+        bs = get_balance_sheet(_build_query(asof, compare_prevfy))
+    except ReportClientError as e:
         return html.Div(), f"Preview failed: {e}", no_update
 
-    if resp.status_code != 200:
-        msg = f"Preview failed ({resp.status_code})"
-        try:
-            msg = resp.json().get("error", msg)
-        except Exception:
-            pass
-        return html.Div(), msg, no_update
-
-    bs = resp.json()
     return render_bs_preview(bs), "", asof_date
 
 
@@ -303,25 +278,10 @@ def export_bs(_, asof_date, compare_vals):
     asof = date.fromisoformat(asof_date)
     compare_prevfy = "on" in (compare_vals or [])
 
-    _, xlsx_url = _build_query(asof, compare_prevfy)
-
     try:
-        resp = requests.get(
-            xlsx_url,
-            headers={"X-Internal-Token": API_TOKEN()},
-            verify=False,
-            timeout=30,
-        )
-    except Exception as e:
+        content = get_balance_sheet_xlsx(_build_query(asof, compare_prevfy))
+    except ReportClientError as e:
         return no_update, f"Export failed: {e}"
 
-    if resp.status_code != 200:
-        msg = f"Export failed ({resp.status_code})"
-        try:
-            msg = resp.json().get("error", msg)
-        except Exception:
-            pass
-        return no_update, msg
-
     filename = f"balance_sheet_{asof.isoformat()}.xlsx"
-    return dcc.send_bytes(resp.content, filename), "Exported."
+    return dcc.send_bytes(content, filename), "Exported."
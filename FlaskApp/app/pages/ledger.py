@@ -12,6 +12,7 @@ from decimal import Decimal, InvalidOperation
 
 import FlaskApp.app.common as common
 from FlaskApp.app.services.accounts import get_accounts
+from FlaskApp.app.services.report_client import ReportClientError, get_account_ledger
 
 API_TOKEN = lambda: common.access_secret_version(
     "global_parameters", None, "api_token"
@@ -136,18 +137,12 @@ def layout(account_id=None,account_name=None,txn_id=None, **_):
     
     entity_name = session.get("current_entity")
 
-    url = common.absolute_url(f"/api/accounts/{account_id}/ledger")
-
-    ledger_resp = requests.get(
-        url,
-        headers={"X-Internal-Token": API_TOKEN()},
-        verify=common.api_verify,
-    )
-
-    if ledger_resp.status_code != 200:
+    try:
+        ledger_rows = get_account_ledger(int(account_id))
+    except ReportClientError:
         return html.Div("Failed to load ledger")
 
-    ledger_df = pd.DataFrame(ledger_resp.json())
+    ledger_df = pd.DataFrame(ledger_rows)
 
     selected_row = 0
     if txn_id is not None:
@@ -918,17 +913,11 @@ def refresh_ledger_table(_refresh_token, account_id, last_saved_txn_id,selected_
     if not account_id:
         return dash.no_update, dash.no_update, no_update#, None#, []
 
-    url = common.absolute_url(f"/api/accounts/{account_id}/ledger")
-
-    ledger_resp = requests.get(
-        url,
-        headers={"X-Internal-Token": API_TOKEN()},
-        verify=common.api_verify,
-    )
-    if ledger_resp.status_code != 200:
+    try:
+        rows = get_account_ledger(int(account_id))
+    except ReportClientError:
         return dash.no_update, dash.no_update,no_update#, None#, []
 
-    rows = ledger_resp.json()
     if not rows:
         return [], [], []#, None#, []
 
@@ -1,17 +1,13 @@
-import requests
 import dash
 from dash import html, dcc, Input, Output, State, callback, no_update
 from datetime import date, timedelta
-from urllib.parse import parse_qs, urlencode
+from urllib.parse import parse_qs
 from flask import session as flask_session
 
-import FlaskApp.app.common as common
+from FlaskApp.app.services.report_client import ReportClientError, get_pnl, get_pnl_xlsx
 
 dash.register_page(__name__, path="/pnl")
 
-def API_TOKEN() -> str:
-    return common.access_secret_version("global_parameters", None, "api_token")
-
 
 FISCAL_YEAR_START_MONTH = 7  # July
 FISCAL_YEAR_START_DAY = 1
@@ -245,28 +241,13 @@ def export_pnl(_, start_date, end_date):
     if entity_name:
         params["entity"] = entity_name
 
-    url = common.absolute_url(f"/api/reports/pnl?" + urlencode(params))
-
     try:
-        resp = requests.get(
-            url,
-            headers={"X-Internal-Token": API_TOKEN()},
-            verify=common.api_verify,
-            timeout=30,
-        )
-    except Exception as e:
+        content = get_pnl_xlsx(params)
+    except ReportClientError as e:
         return no_update, f"Export failed: {e}"
 
-    if resp.status_code != 200:
-        msg = f"Export failed ({resp.status_code})"
-        try:
-            msg = resp.json().get("error", msg)
-        except Exception:
-            pass
-        return no_update, msg
-
     filename = f"profit_and_loss_{start_date}_to_{end_date}.xlsx"
-    return dcc.send_bytes(resp.content, filename), "Exported."
+    return dcc.send_bytes(content, filename), "Exported."
 
 
 @callback(
@@ -302,26 +283,9 @@ def load_pnl_preview(start_date, end_date):
     if entity_name:
         params["entity"] = entity_name
 
-    url = common.absolute_url(f'/api/reports/pnl?' + urlencode(params))
-
     try:
-        resp = requests.get(
-            url,
-            headers={"X-Internal-Token": API_TOKEN()},
-            verify=common.api_verify,
-            timeout=30,
-        )
-    except Exception as e:
+        pnl = get_pnl(params)
+    except ReportClientError as e:
         return html.Div(), f"Preview failed: {e}"
 
-    if resp.status_code != 200:
-        msg = f"Preview failed ({resp.status_code})"
-        try:
-            msg = resp.json().get("error", msg)
-        except Exception:
-            pass
-        return html.Div(), msg
-
-    pnl = resp.json()
     return render_pnl_preview(pnl), ""
-
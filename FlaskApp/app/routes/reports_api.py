@@ -2,17 +2,22 @@
 from __future__ import annotations
 
 from datetime import date
-from io import BytesIO
 
-from flask import Blueprint, abort, jsonify, request, session, send_file
+from flask import Blueprint, Response, abort, jsonify, request, stream_with_context
 
 import FlaskApp.app.common as common
-from FlaskApp.app.models.entity import Entity
-from FlaskApp.app.services.pnl_report import build_pnl
-from FlaskApp.app.services.pnl_excel import build_pnl_workbook
-from FlaskApp.app.services.balance_sheet_report import build_balance_sheet
-from FlaskApp.app.services.balance_sheet_excel import build_balance_sheet_workbook
-from FlaskApp.app.accounting_db import db
+from FlaskApp.app.services.pnl_excel import build_pnl_workbook, pnl_subtitle
+from FlaskApp.app.services.balance_sheet_excel import balance_sheet_subtitle, build_balance_sheet_workbook
+from FlaskApp.app.services.entities import EntityInfo, get_entity_by_id, get_entity_by_name, session_entity_id
+from FlaskApp.app.services.excel_stream import XLSX_MIMETYPE, stream_workbook
+from FlaskApp.app.services.general_ledger_export import (
+    build_general_ledger_workbook,
+    general_ledger_subtitle,
+    iter_general_ledger,
+    iter_general_ledger_csv,
+)
+from FlaskApp.app.services.report_cache import cached_balance_sheet, cached_pnl
+from FlaskApp.app.services.report_periods import balance_sheet_cols_from_args, pnl_periods_from_args
 
 bp = Blueprint("reports_api", __name__)
 
@@ -23,7 +28,16 @@ def _require_token():
         abort(403)
 
 
-def _get_entity_from_request() -> Entity | None:
+def _xlsx_response(wb, download_name: str) -> Response:
+    """Stream a (write-only) workbook as an attachment, chunk by chunk."""
+    return Response(
+        stream_workbook(wb),
+        mimetype=XLSX_MIMETYPE,
+        headers={"Content-Disposition": f'attachment; filename="{download_name}"'},
+    )
+
+
+def _get_entity_from_request() -> EntityInfo | None:
     """Resolve entity for a report request.
 
     Important: Dash callbacks in this codebase fetch these endpoints via server-side
@@ -42,17 +56,15 @@ def _get_entity_from_request() -> Entity | None:
     # Prefer explicit query params
     entity_id = request.args.get("entity_id", type=int)
     if entity_id:
-        return db.session.query(Entity).filter(Entity.id == entity_id).one_or_none()
+        return get_entity_by_id(entity_id)
 
     entity_name = request.args.get("entity")
     if entity_name:
-        return db.session.query(Entity).filter(Entity.name == entity_name).one_or_none()
+        return get_entity_by_name(entity_name)
 
     # Fall back to current session entity
-    entity_name = session.get("current_entity")
-    if not entity_name:
-        return None
-    return db.session.query(Entity).filter(Entity.name == entity_name).one_or_none()
+    entity_id = session_entity_id()
+    return get_entity_by_id(entity_id) if entity_id is not None else None
 
 
 @bp.route("/pnl", methods=["GET"])
@@ -64,21 +76,12 @@ def pnl_json():
         return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
 
     # Example query params: ?p1_start=2023-07-01&p1_end=2024-06-30&p2_start=2024-07-01&p2_end=2025-06-30
-    periods = []
-    i = 1
-    while True:
-        s = request.args.get(f"p{i}_start")
-        e = request.args.get(f"p{i}_end")
-        lbl = request.args.get(f"p{i}_label") or f"Period {i}"
-        if not s or not e:
-            break
-        periods.append((lbl, date.fromisoformat(s), date.fromisoformat(e)))
-        i += 1
+    periods = pnl_periods_from_args(request.args)
 
     if not periods:
         return jsonify({"error": "Provide at least p1_start and p1_end"}), 400
 
-    return jsonify(build_pnl(entity.id, periods))
+    return jsonify(cached_pnl(entity.id, periods))
 
 
 @bp.route("/pnl.xlsx", methods=["GET"])
@@ -89,36 +92,17 @@ def pnl_excel():
     if not entity:
         return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
 
-    periods = []
-    i = 1
-    while True:
-        s = request.args.get(f"p{i}_start")
-        e = request.args.get(f"p{i}_end")
-        lbl = request.args.get(f"p{i}_label") or f"Period {i}"
-        if not s or not e:
-            break
-        periods.append((lbl, date.fromisoformat(s), date.fromisoformat(e)))
-        i += 1
+    periods = pnl_periods_from_args(request.args)
 
     if not periods:
         return jsonify({"error": "Provide at least p1_start and p1_end"}), 400
 
-    pnl = build_pnl(entity.id, periods)
+    pnl = cached_pnl(entity.id, periods)
 
     # Title range string like your example
-    report_title_range = f"{periods[0][1].strftime('%B %Y')} - {periods[-1][2].strftime('%B %Y')}"
-    wb = build_pnl_workbook(pnl, entity.name, report_title_range)
-
-    bio = BytesIO()
-    wb.save(bio)
-    bio.seek(0)
-
-    return send_file(
-        bio,
-        as_attachment=True,
-        download_name="profit_and_loss.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    wb = build_pnl_workbook(pnl, entity.name, pnl_subtitle(periods))
+
+    return _xlsx_response(wb, "profit_and_loss.xlsx")
 
 @bp.route("/balance_sheet", methods=["GET"])
 def balance_sheet_json():
@@ -128,20 +112,12 @@ def balance_sheet_json():
     if not entity:
         return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
 
-    cols = []
-    i = 1
-    while True:
-        d = request.args.get(f"c{i}_date")
-        lbl = request.args.get(f"c{i}_label") or f"As of {i}"
-        if not d:
-            break
-        cols.append((lbl, date.fromisoformat(d)))
-        i += 1
+    cols = balance_sheet_cols_from_args(request.args)
 
     if not cols:
         return jsonify({"error": "Provide at least c1_date"}), 400
 
-    return jsonify(build_balance_sheet(entity.id, cols))
+    return jsonify(cached_balance_sheet(entity.id, cols))
 
 
 @bp.route("/balance_sheet.xlsx", methods=["GET"])
@@ -152,32 +128,63 @@ def balance_sheet_excel():
     if not entity:
         return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
 
-    cols = []
-    i = 1
-    while True:
-        d = request.args.get(f"c{i}_date")
-        lbl = request.args.get(f"c{i}_label") or f"As of {i}"
-        if not d:
-            break
-        cols.append((lbl, date.fromisoformat(d)))
-        i += 1
+    cols = balance_sheet_cols_from_args(request.args)
 
     if not cols:
         return jsonify({"error": "Provide at least c1_date"}), 400
 
-    bs = build_balance_sheet(entity.id, cols)
+    bs = cached_balance_sheet(entity.id, cols)
+
+    wb = build_balance_sheet_workbook(bs, entity.name, balance_sheet_subtitle(cols))
 
-    subtitle = f"As of {cols[-1][1].strftime('%B %d, %Y')}"
-    wb = build_balance_sheet_workbook(bs, entity.name, subtitle)
+    return _xlsx_response(wb, "balance_sheet.xlsx")
 
-    bio = BytesIO()
-    wb.save(bio)
-    bio.seek(0)
 
-    return send_file(
-        bio,
-        as_attachment=True,
-        download_name="balance_sheet.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+def _general_ledger_range():
+    """Optional ?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD; raises ValueError if malformed."""
+    start = request.args.get("start_date")
+    end = request.args.get("end_date")
+    return (date.fromisoformat(start) if start else None, date.fromisoformat(end) if end else None)
+
+
+@bp.route("/general_ledger.csv", methods=["GET"])
+def general_ledger_csv():
+    _require_token()
+
+    entity = _get_entity_from_request()
+    if not entity:
+        return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
+
+    try:
+        start_date, end_date = _general_ledger_range()
+    except ValueError:
+        return jsonify({"error": "start_date/end_date must be YYYY-MM-DD"}), 400
+
+    # Rows are read from the DB while the response streams, so keep the app context
+    rows = iter_general_ledger(entity.id, start_date, end_date)
+    return Response(
+        stream_with_context(iter_general_ledger_csv(rows)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="general_ledger.csv"'},
     )
 
+
+@bp.route("/general_ledger.xlsx", methods=["GET"])
+def general_ledger_excel():
+    _require_token()
+
+    entity = _get_entity_from_request()
+    if not entity:
+        return jsonify({"error": "No current entity (pass ?entity=... or select one)"}), 400
+
+    try:
+        start_date, end_date = _general_ledger_range()
+    except ValueError:
+        return jsonify({"error": "start_date/end_date must be YYYY-MM-DD"}), 400
+
+    wb = build_general_ledger_workbook(
+        iter_general_ledger(entity.id, start_date, end_date),
+        entity.name,
+        general_ledger_subtitle(start_date, end_date),
+    )
+    return _xlsx_response(wb, "general_ledger.xlsx")
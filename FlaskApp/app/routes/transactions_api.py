@@ -6,19 +6,29 @@ from datetime import date as date_cls, datetime
 from typing import Any, Optional
 
 from flask import Blueprint, abort, jsonify, request, session
-from sqlalchemy import cast
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.types import Integer
 
 from FlaskApp.app.accounting_db import db
-from FlaskApp.app.models.entity import Entity
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
-from FlaskApp.app.services.transaction_list import get_transaction_lines, get_transaction_list
+from FlaskApp.app.services.account_balances import refresh_account_balances
+from FlaskApp.app.services.entities import session_entity_id
+from FlaskApp.app.services.payee_suggestions import update_payee_index
+from FlaskApp.app.services.report_cache import bump_ledger_version
+from FlaskApp.app.services.transaction_numbers import allocate_transaction_numbers
+from FlaskApp.app.services.transaction_list import (
+    count_transactions,
+    get_transaction_lines,
+    get_transaction_page,
+)
+from FlaskApp.app.utils.money import from_cents, to_cents
 import FlaskApp.app.common as common
 
 bp = Blueprint("transactions_api", __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 
 def _parse_iso_date(value: Any) -> Optional[date_cls]:
     """Parse an ISO-8601 date (YYYY-MM-DD) into a datetime.date."""
@@ -34,10 +44,9 @@ def _parse_iso_date(value: Any) -> Optional[date_cls]:
     return None
 
 
-def _as_money(v: Any) -> float:
-    if v in (None, ""):
-        return 0.0
-    return float(v)
+def _as_cents(v: Any) -> int:
+    """Debit/credit input (number or numeric string) -> integer cents."""
+    return to_cents(v)
 
 
 def _resolve_entity_id_from_session() -> int:
@@ -49,21 +58,11 @@ def _resolve_entity_id_from_session() -> int:
     if not entity_name:
         raise ValueError("No current entity in session")
 
-    entity = db.session.query(Entity).filter(Entity.name == entity_name).one_or_none()
-    if not entity:
+    entity_id = session_entity_id()
+    if entity_id is None:
         raise ValueError(f"Unknown entity in session: {entity_name!r}")
 
-    return int(entity.id)
-
-
-def _next_transaction_id(entity_id: int) -> int:
-    """Next sequential transaction_id for this entity_id."""
-    max_id = (
-        db.session.query(db.func.max(cast(Transaction.transaction_id, Integer)))
-        .filter(Transaction.entity_id == entity_id)
-        .scalar()
-    )
-    return int(max_id or 0) + 1
+    return entity_id
 
 
 @bp.route("/transactions", methods=["GET"])
@@ -73,21 +72,25 @@ def list_transactions():
         abort(403)
 
     entity_name = session.get("current_entity")
-    status = request.args.get("status")
-    start_date = request.args.get("start_date")
-    end_date = request.args.get("end_date")
-    q = request.args.get("q")
-    amount = request.args.get("amount")
-
-    rows = get_transaction_list(
+    filters = dict(
         entity_name=entity_name,
-        status=status,
-        start_date=start_date,
-        end_date=end_date,
-        search_text=q,
-        search_amount=amount,
+        status=request.args.get("status"),
+        start_date=request.args.get("start_date"),
+        end_date=request.args.get("end_date"),
+        search_text=request.args.get("q"),
+        search_amount=request.args.get("amount"),
     )
 
+    # Keyset pagination: ?limit=N&cursor=<X-Next-Cursor of the previous page>
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor = request.args.get("cursor") or None
+
+    try:
+        rows, next_cursor = get_transaction_page(limit, cursor=cursor, **filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     result = []
     for r in rows:
         result.append(
@@ -103,7 +106,11 @@ def list_transactions():
             }
         )
 
-    return jsonify(result)
+    resp = jsonify(result)
+    resp.headers["X-Total-Count"] = str(count_transactions(**filters))
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor
+    return resp
 
 
 @bp.route("/transactions/<int:transaction_id>", methods=["GET"])
@@ -135,12 +142,12 @@ def update_transaction(transaction_id: int):
     if not txn_date:
         return jsonify({"error": "Missing or invalid 'txn_date' (expected YYYY-MM-DD)"}), 400
 
-    total_debit = 0.0
-    total_credit = 0.0
+    total_debit = 0
+    total_credit = 0
 
     for line in lines:
-        debit = _as_money(line.get("debit"))
-        credit = _as_money(line.get("credit"))
+        debit = _as_cents(line.get("debit"))
+        credit = _as_cents(line.get("credit"))
 
         if debit < 0 or credit < 0:
             return jsonify({"error": "Negative amounts are not allowed"}), 400
@@ -150,13 +157,18 @@ def update_transaction(transaction_id: int):
         total_debit += debit
         total_credit += credit
 
-    if round(total_debit, 2) != round(total_credit, 2):
-        return jsonify({"error": f"Transaction not balanced: debit {total_debit:.2f} vs credit {total_credit:.2f}"}), 400
+    if total_debit != total_credit:
+        return jsonify({"error": f"Transaction not balanced: debit {from_cents(total_debit):.2f} vs credit {from_cents(total_credit):.2f}"}), 400
 
     txn = db.session.get(Transaction, transaction_id)
     if not txn:
         return jsonify({"error": "Transaction not found"}), 404
 
+    # Snapshot rows from the earlier of the old/new date onward may change
+    affected_account_ids = {int(l.account_id) for l in txn.lines}
+    balances_from = min(txn.date, txn_date) if txn.date else txn_date
+    update_payee_index(txn.entity_id, [txn.id], delta=-1)
+
     txn.date = txn_date
     txn.description = description
 
@@ -164,8 +176,8 @@ def update_transaction(transaction_id: int):
     TransactionLine.query.filter_by(transaction_id=transaction_id).delete()
 
     for line in lines:
-        debit = _as_money(line.get("debit"))
-        credit = _as_money(line.get("credit"))
+        debit = _as_cents(line.get("debit"))
+        credit = _as_cents(line.get("credit"))
 
         account_id = line.get("account_id")
         if not account_id:
@@ -176,10 +188,16 @@ def update_transaction(transaction_id: int):
                 transaction_id=txn.id,
                 account_id=int(account_id),
                 is_debit=debit > 0,
-                amount=debit if debit > 0 else credit,
+                amount_cents=debit if debit > 0 else credit,
                 memo=line.get("memo"),
             )
         )
+        affected_account_ids.add(int(account_id))
+
+    db.session.flush()
+    refresh_account_balances(txn.entity_id, affected_account_ids, balances_from)
+    update_payee_index(txn.entity_id, [txn.id])
+    bump_ledger_version(txn.entity_id)
 
     db.session.commit()
     return jsonify({"status": "ok","transaction_id": txn.transaction_id, "id": txn.id}), 200
@@ -204,11 +222,11 @@ def create_transaction():
     if not txn_date:
         return jsonify({"error": "Missing or invalid 'txn_date' (expected YYYY-MM-DD)"}), 400
 
-    total_debit = 0.0
-    total_credit = 0.0
+    total_debit = 0
+    total_credit = 0
     for line in lines:
-        debit = _as_money(line.get("debit"))
-        credit = _as_money(line.get("credit"))
+        debit = _as_cents(line.get("debit"))
+        credit = _as_cents(line.get("credit"))
 
         if debit < 0 or credit < 0:
             return jsonify({"error": "Negative amounts are not allowed"}), 400
@@ -218,48 +236,36 @@ def create_transaction():
         total_debit += debit
         total_credit += credit
 
-    if round(total_debit, 2) != round(total_credit, 2):
-        return jsonify({"error": f"Transaction not balanced: debit {total_debit:.2f} vs credit {total_credit:.2f}"}), 400
+    if total_debit != total_credit:
+        return jsonify({"error": f"Transaction not balanced: debit {from_cents(total_debit):.2f} vs credit {from_cents(total_credit):.2f}"}), 400
 
     try:
         entity_id = _resolve_entity_id_from_session()  # ✅ int id, not name string
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
-    max_txn = (
-        db.session.query(db.func.max(cast(Transaction.transaction_id, Integer)))
-        .filter(Transaction.entity_id == entity_id)
-        .scalar()
-    )
-    common.logger.debug(f"entity_id={entity_id!r} existing max txn_id={max_txn!r}")
-    common.logger.debug(
-        f"existing entity_ids={db.session.query(Transaction.entity_id).distinct().all()}"
-    )
-
     txn = Transaction(
         entity_id=entity_id,
-        transaction_id=_next_transaction_id(entity_id),  # ✅ now finds the right rows
+        transaction_id=allocate_transaction_numbers(entity_id),  # per-entity sequence, locked until commit
         date=txn_date,
         description=description,
         created_at=datetime.utcnow(),
         posted_at=datetime.utcnow(),
     )
+    common.logger.debug(f"entity_id={entity_id!r} allocated txn_id={txn.transaction_id!r}")
 
     db.session.add(txn)
 
     try:
         db.session.flush()  # ensures txn.id is available
     except IntegrityError:
+        # Only if a row was numbered outside the sequence (see services.transaction_numbers)
         db.session.rollback()
-        # Defensive: if DB still has a global unique constraint, fall back to global max
-        global_max = db.session.query(db.func.max(cast(Transaction.transaction_id, Integer))).scalar()
-        txn.transaction_id = int(global_max or 0) + 1
-        db.session.add(txn)
-        db.session.flush()
+        return jsonify({"error": f"Transaction number {txn.transaction_id} is already in use"}), 409
 
     for line in lines:
-        debit = _as_money(line.get("debit"))
-        credit = _as_money(line.get("credit"))
+        debit = _as_cents(line.get("debit"))
+        credit = _as_cents(line.get("credit"))
 
         account_id = line.get("account_id")
         if not account_id:
@@ -270,11 +276,20 @@ def create_transaction():
                 transaction_id=txn.id,
                 account_id=int(account_id),
                 is_debit=debit > 0,
-                amount=debit if debit > 0 else credit,
+                amount_cents=debit if debit > 0 else credit,
                 memo=line.get("memo"),
             )
         )
 
+    db.session.flush()
+    refresh_account_balances(
+        entity_id,
+        {int(line["account_id"]) for line in lines},
+        txn_date,
+    )
+    update_payee_index(entity_id, [txn.id])
+    bump_ledger_version(entity_id)
+
     db.session.commit()
     return jsonify({"status": "ok", "transaction_id": txn.transaction_id, "id": txn.id}), 201
 
@@ -288,8 +303,17 @@ def delete_transaction(transaction_id: int):
     if not txn:
         return jsonify({"error": "Transaction not found"}), 404
 
+    entity_id = txn.entity_id
+    affected_account_ids = {int(l.account_id) for l in txn.lines}
+    balances_from = txn.date
+    update_payee_index(entity_id, [txn.id], delta=-1)
+
     # Transaction.lines relationship uses cascade="all, delete-orphan"
     db.session.delete(txn)
+    db.session.flush()
+    refresh_account_balances(entity_id, affected_account_ids, balances_from)
+    bump_ledger_version(entity_id)
+
     db.session.commit()
     return jsonify({"status": "ok"}), 200
 
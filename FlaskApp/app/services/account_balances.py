@@ -0,0 +1,124 @@
+# FlaskApp/app/services/account_balances.py
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, func, insert
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.account_daily_balance import AccountDailyBalance
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+
+
+def refresh_account_balances(
+    entity_id: int,
+    account_ids: Iterable[int],
+    from_date: Optional[date] = None,
+) -> None:
+    """
+    Recompute the daily balance snapshot rows for `account_ids` from `from_date` onward.
+
+    Rows before `from_date` are left untouched and used as the opening balance, so a
+    write only re-aggregates the suffix of history it can have affected. Pass
+    from_date=None to rebuild the accounts' whole history.
+
+    Call this after the transaction changes have been flushed and before commit, so the
+    snapshot is committed atomically with the transactions.
+    """
+    account_ids = {int(a) for a in account_ids if a}
+    if not account_ids:
+        return
+
+    stale = (
+        db.session.query(AccountDailyBalance)
+        .filter(AccountDailyBalance.entity_id == entity_id)
+        .filter(AccountDailyBalance.account_id.in_(account_ids))
+    )
+    if from_date is not None:
+        stale = stale.filter(AccountDailyBalance.date >= from_date)
+    stale.delete(synchronize_session=False)
+
+    # Opening balance per account = latest surviving snapshot before from_date
+    opening: Dict[int, int] = {}
+    if from_date is not None:
+        latest = (
+            db.session.query(
+                AccountDailyBalance.account_id.label("account_id"),
+                func.max(AccountDailyBalance.date).label("date"),
+            )
+            .filter(AccountDailyBalance.entity_id == entity_id)
+            .filter(AccountDailyBalance.account_id.in_(account_ids))
+            .filter(AccountDailyBalance.date < from_date)
+            .group_by(AccountDailyBalance.account_id)
+            .subquery()
+        )
+        opening = {
+            int(r.account_id): int(r.balance_cents or 0)
+            for r in (
+                db.session.query(AccountDailyBalance.account_id, AccountDailyBalance.balance_cents)
+                .join(
+                    latest,
+                    (latest.c.account_id == AccountDailyBalance.account_id)
+                    & (latest.c.date == AccountDailyBalance.date),
+                )
+                .filter(AccountDailyBalance.entity_id == entity_id)
+                .all()
+            )
+        }
+
+    net_expr = func.sum(
+        case(
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
+        )
+    )
+
+    q = (
+        db.session.query(
+            TransactionLine.account_id.label("account_id"),
+            Transaction.date.label("date"),
+            net_expr.label("net_activity"),
+        )
+        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(TransactionLine.account_id.in_(account_ids))
+        .group_by(TransactionLine.account_id, Transaction.date)
+        .order_by(TransactionLine.account_id, Transaction.date)
+    )
+    if from_date is not None:
+        q = q.filter(Transaction.date >= from_date)
+
+    rows = []
+    running = dict(opening)
+    for r in q.all():
+        acct_id = int(r.account_id)
+        running[acct_id] = running.get(acct_id, 0) + int(r.net_activity or 0)
+        rows.append({
+            "entity_id": entity_id,
+            "account_id": acct_id,
+            "date": r.date,
+            "balance_cents": running[acct_id],
+        })
+
+    if rows:
+        db.session.execute(insert(AccountDailyBalance), rows)
+
+
+def rebuild_account_balances(entity_id: int) -> None:
+    """Rebuild every snapshot row for an entity from scratch (e.g. after a bulk load)."""
+    account_ids = {
+        int(a)
+        for (a,) in (
+            db.session.query(TransactionLine.account_id)
+            .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+            .filter(Transaction.entity_id == entity_id)
+            .distinct()
+            .all()
+        )
+    }
+    db.session.query(AccountDailyBalance).filter(
+        AccountDailyBalance.entity_id == entity_id
+    ).delete(synchronize_session=False)
+    refresh_account_balances(entity_id, account_ids, from_date=None)
@@ -0,0 +1,275 @@
+# FlaskApp/app/services/account_hierarchy.py
+# Per-entity account hierarchy, parsed once per accounts_version and shared by the reports.
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from FlaskApp.app.accounting_db import report_session
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.entity import Entity
+
+
+def parse_account_path(name: str) -> Tuple[str, ...]:
+    """Split a colon-separated account name into its path, e.g. "Expenses:Fuel" -> ("Expenses", "Fuel")."""
+    return tuple(p.strip() for p in (name or "").split(":") if p.strip())
+
+
+@dataclass(frozen=True)
+class AccountInfo:
+    id: int
+    name: str
+    type: str
+    path: Tuple[str, ...]
+
+
+@dataclass
+class ReportTree:
+    """
+    Report layout of an entity's accounts. Node 0..k are the section roots (in
+    section order); every other node is created after its parent, so iterating
+    node ids in reverse visits children before parents.
+    """
+    sections: Tuple[str, ...]
+    names: List[str] = field(default_factory=list)
+    parents: List[int] = field(default_factory=list)  # -1 for section roots
+    depths: List[int] = field(default_factory=list)   # 0 for section roots
+    paths: List[Tuple[str, ...]] = field(default_factory=list)  # path below the section
+    children: List[List[int]] = field(default_factory=list)     # sorted by name
+    roots: Dict[str, int] = field(default_factory=dict)
+    account_nodes: Dict[int, int] = field(default_factory=dict)  # account id -> node
+    _index: Dict[Tuple[str, ...], int] = field(default_factory=dict, repr=False)
+
+    # Set by finalize(): every (descendant-or-self, node) pair grouped by node, and
+    # where each node's run starts, so a rollup is one np.add.reduceat
+    rollup_nodes: np.ndarray = field(default=None, repr=False)
+    rollup_starts: np.ndarray = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        for sec in self.sections:
+            self.roots[sec] = self._new_node(sec, -1, ())
+
+    def _new_node(self, name: str, parent: int, path: Tuple[str, ...]) -> int:
+        idx = len(self.names)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.depths.append(0 if parent < 0 else self.depths[parent] + 1)
+        self.paths.append(path)
+        self.children.append([])
+        if parent >= 0:
+            self.children[parent].append(idx)
+        return idx
+
+    def node(self, section: str, path: Sequence[str]) -> int:
+        """Node for `path` under `section`, creating it (and its ancestors) if needed."""
+        cur = self.roots[section]
+        for i in range(len(path)):
+            key = (section,) + tuple(path[:i + 1])
+            nxt = self._index.get(key)
+            if nxt is None:
+                nxt = self._index[key] = self._new_node(path[i], cur, key[1:])
+            cur = nxt
+        return cur
+
+    def finalize(self) -> "ReportTree":
+        """Sort children and index ancestors; the tree must not grow after this."""
+        for kids in self.children:
+            kids.sort(key=self.names.__getitem__)
+
+        descendants: List[List[int]] = [[node] for node in range(len(self.names))]
+        for node in range(len(self.names)):
+            anc = self.parents[node]
+            while anc >= 0:
+                descendants[anc].append(node)
+                anc = self.parents[anc]
+
+        self.rollup_nodes = np.array([d for ds in descendants for d in ds], dtype=np.intp)
+        self.rollup_starts = np.cumsum([0] + [len(ds) for ds in descendants[:-1]], dtype=np.intp)
+        return self
+
+
+class TreeAmounts:
+    """Per-column amounts for one report build over a (shared, read-only) ReportTree."""
+
+    def __init__(self, tree: ReportTree, n_cols: int):
+        self.tree = tree
+        self.n = n_cols
+        self.direct = np.zeros((len(tree.names), n_cols))
+        self.touched = np.zeros(len(tree.names), dtype=bool)
+        self.total = self.direct
+        # Only nodes that received an amount (and their ancestors) are reported
+        self.present: List[bool] = [False] * len(tree.names)
+
+    def add(self, node: int, col_idx: int, amount: float) -> None:
+        self.direct[node, col_idx] += float(amount or 0.0)
+        self.touched[node] = True
+
+    def add_many(self, nodes: Sequence[int], col_idxs: Sequence[int], amounts: Sequence[float]) -> None:
+        nodes = np.asarray(nodes, dtype=np.intp)
+        np.add.at(self.direct, (nodes, np.asarray(col_idxs, dtype=np.intp)), np.asarray(amounts, dtype=float))
+        self.touched[nodes] = True
+
+    def rollup(self) -> None:
+        """total[a] = sum of direct[d] over every descendant-or-self d of a."""
+        nodes, starts = self.tree.rollup_nodes, self.tree.rollup_starts
+        self.total = np.add.reduceat(self.direct[nodes], starts, axis=0)
+        self.present = np.logical_or.reduceat(self.touched[nodes], starts).tolist()
+
+    def section_total(self, section: str) -> List[float]:
+        return self.total[self.tree.roots[section]].tolist()
+
+    def flatten(self, section: str, values_key: str) -> List[Dict[str, Any]]:
+        """
+        Rows of a section (its root excluded), preserving the FULL PATH:
+          - node line ("group" or "account")
+          - children lines
+          - "Total X" line if the node has children
+        """
+        rows: List[Dict[str, Any]] = []
+        totals = self.total.tolist()
+        row_totals = self.total.sum(axis=1).tolist()
+        for child in self._present_children(self.tree.roots[section]):
+            self._flatten(child, 0, values_key, totals, row_totals, rows)
+        return rows
+
+    def _present_children(self, node: int) -> List[int]:
+        return [c for c in self.tree.children[node] if self.present[c]]
+
+    def _flatten(
+        self,
+        node: int,
+        level: int,
+        values_key: str,
+        totals: List[List[float]],
+        row_totals: List[float],
+        rows: List[Dict[str, Any]],
+    ) -> None:
+        name = self.tree.names[node]
+        path = list(self.tree.paths[node])
+        full_path = ":".join(path)
+        values = totals[node]
+        children = self._present_children(node)
+
+        rows.append({
+            "label": name,
+            "path": path,
+            "full_path": full_path,
+            "level": level,
+            "kind": "group" if children else "account",
+            values_key: values,
+            "row_total": row_totals[node],
+        })
+
+        for child in children:
+            self._flatten(child, level + 1, values_key, totals, row_totals, rows)
+
+        if children:
+            rows.append({
+                "label": f"Total {name}",
+                "path": path,
+                "full_path": full_path,
+                "level": level,
+                "kind": "total",
+                values_key: values[:],
+                "row_total": row_totals[node],
+            })
+
+
+class AccountHierarchy:
+    """An entity's accounts (parsed) and the report layouts built from them."""
+
+    def __init__(self, entity_id: int, version: int, accounts: Iterable[AccountInfo]):
+        self.entity_id = entity_id
+        self.version = version
+        self.accounts: Dict[int, AccountInfo] = {a.id: a for a in accounts}
+        self._layouts: Dict[str, ReportTree] = {}
+
+    def layout(self, key: str, build: Callable[["AccountHierarchy"], ReportTree]) -> ReportTree:
+        """The report tree `key`, built once per hierarchy by build(self)."""
+        with _lock:
+            tree = self._layouts.get(key)
+        if tree is None:
+            tree = build(self).finalize()
+            with _lock:
+                tree = self._layouts.setdefault(key, tree)
+        return tree
+
+
+_lock = threading.Lock()
+_hierarchies: Dict[int, AccountHierarchy] = {}
+
+
+def get_accounts_version(entity_id: int) -> int:
+    return int(
+        report_session().query(Entity.accounts_version).filter(Entity.id == entity_id).scalar() or 0
+    )
+
+
+def _load_hierarchy(entity_id: int, version: int) -> AccountHierarchy:
+    rows = (
+        report_session().query(Account.id, Account.name, Account.type)
+        .filter(Account.entity_id == entity_id)
+        .all()
+    )
+    return AccountHierarchy(
+        entity_id,
+        version,
+        (AccountInfo(int(r.id), r.name, r.type, parse_account_path(r.name)) for r in rows),
+    )
+
+
+def get_account_hierarchy(entity_id: int, account_ids: Iterable[int] = ()) -> AccountHierarchy:
+    """
+    The entity's cached hierarchy, reloaded when accounts_version has moved on or
+    when it does not know one of `account_ids` (e.g. it was cached from a
+    transaction that bumped the version and was then rolled back).
+    """
+    version = get_accounts_version(entity_id)
+    with _lock:
+        hier = _hierarchies.get(entity_id)
+
+    if hier is None or hier.version != version or any(int(a) not in hier.accounts for a in account_ids):
+        hier = _load_hierarchy(entity_id, version)
+        with _lock:
+            _hierarchies[entity_id] = hier
+    return hier
+
+
+def clear_account_hierarchy_cache() -> None:
+    with _lock:
+        _hierarchies.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_accounts_version(session: Session, flush_context) -> None:
+    """Invalidate cached hierarchies (and reports) of entities whose accounts changed."""
+    entity_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Account):
+            entity_ids.add(obj.entity_id)
+    for obj in session.dirty:
+        if isinstance(obj, Account) and session.is_modified(obj, include_collections=False):
+            entity_ids.add(obj.entity_id)
+    for obj in session.deleted:
+        if isinstance(obj, Account):
+            entity_ids.add(obj.entity_id)
+
+    entity_ids.discard(None)
+    if not entity_ids:
+        return
+
+    entities = Entity.__table__
+    session.connection().execute(
+        update(entities)
+        .where(entities.c.id.in_(entity_ids))
+        .values(
+            accounts_version=entities.c.accounts_version + 1,
+            ledger_version=entities.c.ledger_version + 1,
+        )
+    )
+
@@ -1,13 +1,27 @@
-from FlaskApp.app.accounting_db import db
+from sqlalchemy import case, func
+
+from FlaskApp.app.accounting_db import report_session
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.services.balance_sheet_report import TYPE_TO_SECTION as BS_TYPE_TO_SECTION
+from FlaskApp.app.services.pnl_report import TYPE_TO_SECTION as PNL_TYPE_TO_SECTION
+from FlaskApp.app.utils.money import from_cents
 
 import FlaskApp.app.common as common
 
+
+def is_debit_normal(account_type) -> bool:
+    """True for Assets/Expenses/COGS (balance = debits - credits), False otherwise."""
+    acct_type = (account_type or "").strip()
+    section = BS_TYPE_TO_SECTION.get(acct_type) or PNL_TYPE_TO_SECTION.get(acct_type)
+    return section in ("Assets", "Expenses", "Cost of Goods Sold")
+
+
 def get_account_ledger(account_id):
     account = (
-        db.session.query(Account)
+        report_session().query(Account)
         .filter(Account.id == account_id)
         .one_or_none()
     )
@@ -16,13 +30,13 @@ def get_account_ledger(account_id):
         return None
 
     rows = (
-        db.session.query(
+        report_session().query(
             Transaction.date,
             Transaction.transaction_id,
             Transaction.description,
             Transaction.id.label("transaction_pk"),
             TransactionLine.is_debit,
-            TransactionLine.amount,
+            TransactionLine.amount.label("amount"),
         )
         .join(Transaction, TransactionLine.transaction_id == Transaction.id)
         .filter(TransactionLine.account_id == account_id)
@@ -33,3 +47,133 @@ def get_account_ledger(account_id):
     common.logger.debug(f"Ledger rows for account {account_id}: {len(rows)}")
     
     return account, rows
+
+
+def _account_lines_query(query, account_id, entity_name=None):
+    query = query.filter(TransactionLine.account_id == account_id)
+    if entity_name:
+        query = query.join(Transaction.entity).filter(Entity.name == entity_name)
+    return query
+
+
+def get_account_ledger_rows(
+    account_id,
+    debit_normal,
+    entity_name=None,
+    start_date=None,
+    end_date=None,
+    limit=None,
+    offset=0,
+):
+    """
+    Returns one row per transaction touching the account (newest first) with
+    debit_total, credit_total and the running balance after that transaction.
+
+    The running balance is computed in SQL, in integer cents, with SUM(...) OVER
+    (ORDER BY date, created_at, id), seeded with the opening balance of everything before
+    start_date, so a date window or a single page still carries the correct
+    balance without shipping the whole history.
+
+    debit_normal: True for Assets/Expenses/COGS (balance = debits - credits),
+    False for Liabilities/Equity/Income (balance = credits - debits).
+    """
+    sign = 1 if debit_normal else -1
+
+    opening = 0
+    if start_date:
+        net_expr = func.sum(
+            case(
+                (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+                else_=-TransactionLine.amount_cents,
+            )
+        )
+        opening_q = _account_lines_query(
+            report_session().query(net_expr)
+            .select_from(TransactionLine)
+            .join(Transaction, TransactionLine.transaction_id == Transaction.id),
+            account_id,
+            entity_name,
+        ).filter(Transaction.date < start_date)
+        opening = sign * int(opening_q.scalar() or 0)
+
+    per_txn_q = _account_lines_query(
+        report_session().query(
+            Transaction.id.label("id"),
+            Transaction.date.label("date"),
+            Transaction.created_at.label("created_at"),
+            Transaction.description.label("description"),
+            func.sum(
+                case((TransactionLine.is_debit.is_(True), TransactionLine.amount_cents), else_=0)
+            ).label("debit_total"),
+            func.sum(
+                case((TransactionLine.is_debit.is_(False), TransactionLine.amount_cents), else_=0)
+            ).label("credit_total"),
+        )
+        .select_from(TransactionLine)
+        .join(Transaction, TransactionLine.transaction_id == Transaction.id),
+        account_id,
+        entity_name,
+    )
+    if start_date:
+        per_txn_q = per_txn_q.filter(Transaction.date >= start_date)
+    if end_date:
+        per_txn_q = per_txn_q.filter(Transaction.date <= end_date)
+    per_txn = per_txn_q.group_by(Transaction.id).subquery()
+
+    running = func.sum(sign * (per_txn.c.debit_total - per_txn.c.credit_total)).over(
+        order_by=(per_txn.c.date, per_txn.c.created_at, per_txn.c.id),
+        rows=(None, 0),
+    )
+
+    q = (
+        report_session().query(
+            per_txn.c.id,
+            per_txn.c.date,
+            per_txn.c.description,
+            per_txn.c.debit_total,
+            per_txn.c.credit_total,
+            (running + opening).label("balance"),
+        )
+        .order_by(per_txn.c.date.desc(), per_txn.c.created_at.desc(), per_txn.c.id.desc())
+    )
+    if limit:
+        q = q.limit(limit).offset(offset or 0)
+
+    return q.all()
+
+
+def build_account_ledger(
+    account,
+    entity_name=None,
+    start_date=None,
+    end_date=None,
+    limit=None,
+    page=1,
+):
+    """
+    JSON-friendly ledger for an Account (newest first), as served by
+    /api/accounts/<id>/ledger and used in-process by the Dash ledger page.
+    """
+    debit_normal = is_debit_normal(account.type)
+
+    rows = get_account_ledger_rows(
+        account.id,
+        debit_normal,
+        entity_name=entity_name,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        offset=(page - 1) * limit if limit else 0,
+    )
+
+    result = []
+    for r in rows:  # newest -> oldest
+        result.append({
+            "transaction_id": r.id,
+            "date": r.date.isoformat(),
+            "description": r.description,
+            "debit": from_cents(r.debit_total),
+            "credit": from_cents(r.credit_total),
+            "balance": from_cents(r.balance),
+        })
+    return result
@@ -1,9 +1,19 @@
+from typing import NamedTuple
+
 from sqlalchemy import func, case
-from FlaskApp.app.accounting_db import db
+from FlaskApp.app.accounting_db import report_session
 from FlaskApp.app.models.account import Account
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.utils.money import from_cents
+
+
+class AccountListRow(NamedTuple):
+    id: int
+    name: str
+    debit_total: float
+    credit_total: float
 
 
 def get_account_list(
@@ -13,22 +23,23 @@ def get_account_list(
     Returns one row per account with debit / credit totals.
     """
 
+    # Summed as integer cents, converted to dollars once per row below
     debit_sum = func.sum(
         case(
-            (TransactionLine.is_debit == True, TransactionLine.amount),
+            (TransactionLine.is_debit == True, TransactionLine.amount_cents),
             else_=0,
         )
-    ).label("debit_total")
+    ).label("debit_cents")
 
     credit_sum = func.sum(
         case(
-            (TransactionLine.is_debit == False, TransactionLine.amount),
+            (TransactionLine.is_debit == False, TransactionLine.amount_cents),
             else_=0,
         )
-    ).label("credit_total")
+    ).label("credit_cents")
 
     query = (
-        db.session.query(
+        report_session().query(
             Account.id,
             #Account.code,
             Account.name,
@@ -47,4 +58,7 @@ def get_account_list(
         query = query.filter(Account.entity.has(name=entity_name))
 
 
-    return query.all()
+    return [
+        AccountListRow(r.id, r.name, from_cents(r.debit_cents), from_cents(r.credit_cents))
+        for r in query.all()
+    ]
@@ -1,19 +1,22 @@
 # FlaskApp/app/services/balance_sheet_report.py
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from datetime import date,timedelta
-from typing import Any, Dict, List, Tuple
+from typing import List, Tuple
 
 from sqlalchemy import case, func
 
-from FlaskApp.app.accounting_db import db
+from FlaskApp.app.accounting_db import report_session
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.account_daily_balance import AccountDailyBalance
+from FlaskApp.app.services.account_hierarchy import AccountHierarchy, ReportTree, TreeAmounts, get_account_hierarchy
 
-# If you already have your P&L builder file, we can reuse it to compute Net Income.
-from FlaskApp.app.services.pnl_report import build_pnl  # uses Income/Expense/COGS types
+# Lightweight net-income aggregate (same numbers as build_pnl's net_profit, one query).
+from FlaskApp.app.services.net_income import net_income_for_ranges
+from FlaskApp.app.services.report_periods import period_bounds
+from FlaskApp.app.utils.money import from_cents
 
 
 # --- Balance Sheet account types (from your CSV + common QB/Xero) ---
@@ -66,9 +69,12 @@ INCLUDE_NET_INCOME_LINE = True
 FISCAL_YEAR_START_MONTH = 7  # July (matches your example)
 FISCAL_YEAR_START_DAY = 1
 
-def _parse_path(name: str) -> List[str]:
-    return [p.strip() for p in name.split(":") if p.strip()]
+# Read as-of balances from the account_daily_balances snapshot instead of re-summing
+# every transaction line since the start of time.
+USE_BALANCE_SNAPSHOTS = True
 
+RETAINED_EARNINGS_PATH = ("Shareholders' equity", "Retained Earnings")
+NET_INCOME_PATH = ("Shareholders' equity", "Net Income")
 
 def _bs_display_amount(account_type: str, net_activity: float) -> float:
     """
@@ -83,95 +89,86 @@ def _bs_display_amount(account_type: str, net_activity: float) -> float:
     return float(net_activity or 0.0)
 
 
-@dataclass
-class Node:
-    name: str
-    children: Dict[str, "Node"] = field(default_factory=dict)
-    direct: List[float] = field(default_factory=list)  # per column
-    total: List[float] = field(default_factory=list)   # per column
+def _is_retained_earnings(account_type: str, account_name: str) -> bool:
+    return account_type == "Equity" and "retained earnings" in (account_name or "").lower()
 
-    def ensure_len(self, n: int) -> None:
-        if len(self.direct) < n:
-            self.direct.extend([0.0] * (n - len(self.direct)))
-        if len(self.total) < n:
-            self.total.extend([0.0] * (n - len(self.total)))
 
+def _bs_tree(hier: AccountHierarchy) -> ReportTree:
+    """Balance Sheet layout: section -> group (e.g. Current Assets) -> account name path."""
+    tree = ReportTree(tuple(SECTION_ORDER))
+    for acct in hier.accounts.values():
+        section = TYPE_TO_SECTION.get(acct.type)
+        if not section:
+            continue
 
-def _add_amount(root: Node, path: List[str], col_idx: int, amount: float, n_cols: int) -> None:
-    cur = root
-    for part in path:
-        cur = cur.children.setdefault(part, Node(part))
-    cur.ensure_len(n_cols)
-    cur.direct[col_idx] += float(amount or 0.0)
+        # Skip any actual "Retained Earnings" equity accounts to avoid double-counting
+        if _is_retained_earnings(acct.type, acct.name):
+            continue
 
+        group = TYPE_TO_GROUP.get(acct.type, acct.type)
+        tree.account_nodes[acct.id] = tree.node(section, (group,) + acct.path)
 
-def _rollup(node: Node, n_cols: int) -> List[float]:
-    node.ensure_len(n_cols)
-    total = node.direct[:]
-    for child in node.children.values():
-        child_total = _rollup(child, n_cols)
-        total = [total[i] + child_total[i] for i in range(n_cols)]
-    node.total = total
-    return total
+    # Computed lines injected under Equity by build_balance_sheet
+    tree.node("Equity", RETAINED_EARNINGS_PATH)
+    tree.node("Equity", NET_INCOME_PATH)
+    return tree
 
 
-def _flatten(node: Node, base_path: List[str], level: int, n_cols: int) -> List[Dict[str, Any]]:
+def _query_asof_snapshot_balances(entity_id: int, as_of: date) -> List[Tuple[int, float]]:
     """
-    Flattens while storing full path (no ambiguity, no searching by label).
-    Emits:
-      - node line
-      - child lines
-      - Total node line if node has children
+    Same result as _query_asof_net_activity, read from the account_daily_balances
+    snapshot: one latest-row-<=-as_of lookup per account instead of a history scan.
     """
-    rows: List[Dict[str, Any]] = []
-
-    path = base_path + [node.name]
-    full_path = ":".join(path)
-    has_children = bool(node.children)
-
-    rows.append({
-        "label": node.name,
-        "path": path,
-        "full_path": full_path,
-        "level": level,
-        "kind": "group" if has_children else "account",
-        "cols": node.total[:n_cols],
-        "row_total": sum(node.total[:n_cols]),
-    })
-
-    for key in sorted(node.children.keys()):
-        rows.extend(_flatten(node.children[key], path, level + 1, n_cols))
-
-    if has_children:
-        rows.append({
-            "label": f"Total {node.name}",
-            "path": path,
-            "full_path": full_path,
-            "level": level,
-            "kind": "total",
-            "cols": node.total[:n_cols],
-            "row_total": sum(node.total[:n_cols]),
-        })
+    latest = (
+        report_session().query(
+            AccountDailyBalance.account_id.label("account_id"),
+            func.max(AccountDailyBalance.date).label("date"),
+        )
+        .filter(AccountDailyBalance.entity_id == entity_id)
+        .filter(AccountDailyBalance.date <= as_of)
+        .group_by(AccountDailyBalance.account_id)
+        .subquery()
+    )
 
-    return rows
+    q = (
+        report_session().query(
+            Account.id.label("account_id"),
+            func.sum(AccountDailyBalance.balance_cents).label("net_activity"),
+        )
+        .join(AccountDailyBalance, AccountDailyBalance.account_id == Account.id)
+        .join(
+            latest,
+            (latest.c.account_id == AccountDailyBalance.account_id)
+            & (latest.c.date == AccountDailyBalance.date),
+        )
+        .filter(Account.entity_id == entity_id)
+        .filter(AccountDailyBalance.entity_id == entity_id)
+        .filter(Account.type.in_(BS_TYPES))
+        .group_by(Account.id)
+        .order_by(Account.id)
+    )
+
+    return [(int(r.account_id), from_cents(r.net_activity)) for r in q.all()]
 
 
-def _query_asof_net_activity(entity_id: int, as_of: date) -> List[Tuple[str, str, float]]:
+def _query_asof_net_activity(entity_id: int, as_of: date) -> List[Tuple[int, float]]:
     """
-    Returns (account_type, account_name, net_activity_asof)
+    Returns (account_id, net_activity_asof)
     net_activity_asof = sum(debits) - sum(credits) for all txns <= as_of
     """
+    if USE_BALANCE_SNAPSHOTS:
+        return _query_asof_snapshot_balances(entity_id, as_of)
+
     net_expr = func.sum(
         case(
-            (TransactionLine.is_debit.is_(True), TransactionLine.amount),
-            else_=-TransactionLine.amount,
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
         )
     )
 
     q = (
-        db.session.query(
-            Account.type.label("account_type"),
-            Account.name.label("account_name"),
+        report_session().query(
+            Account.id.label("account_id"),
             net_expr.label("net_activity"),
         )
         .join(TransactionLine, TransactionLine.account_id == Account.id)
@@ -180,95 +177,62 @@ def _query_asof_net_activity(entity_id: int, as_of: date) -> List[Tuple[str, str
         .filter(Transaction.entity_id == entity_id)
         .filter(Account.type.in_(BS_TYPES))
         .filter(Transaction.date <= as_of)
-        .group_by(Account.type, Account.name)
-        .order_by(Account.type, Account.name)
+        .group_by(Account.id)
+        .order_by(Account.id)
     )
 
-    return [(r.account_type, r.account_name, float(r.net_activity or 0.0)) for r in q.all()]
+    return [(int(r.account_id), from_cents(r.net_activity)) for r in q.all()]
 
 def _min_transaction_date(entity_id: int) -> date | None:
     return (
-        db.session.query(func.min(Transaction.date))
-        .filter(Transaction.entity_id == entity_id)
-        .scalar()
-    )
-
-
-def _retained_earnings_distributions(entity_id: int, as_of: date) -> float:
-    """
-    Returns distributions posted to Retained Earnings accounts:
-      debit-positive / credit-negative (debits - credits)
-    In your model these are typically DEBITS (distributions), so this should be positive.
-    """
-    net_expr = func.sum(
-        case(
-            (TransactionLine.is_debit.is_(True), TransactionLine.amount),
-            else_=-TransactionLine.amount,
-        )
-    )
-
-    val = (
-        db.session.query(net_expr)
-        .select_from(Account)
-        .join(TransactionLine, TransactionLine.account_id == Account.id)
-        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
-        .filter(Account.entity_id == entity_id)
+        report_session().query(func.min(Transaction.date))
         .filter(Transaction.entity_id == entity_id)
-        .filter(Account.type == "Equity")
-        .filter(Account.name.ilike("%retained earnings%"))
-        .filter(Transaction.date <= as_of)
         .scalar()
     )
-    return float(val or 0.0)
 
 
-def _net_income_for_range(entity_id: int, start: date, end: date) -> float:
-    """
-    Uses your P&L builder which returns net_profit as a *positive display* number.
-    """
-    pnl = build_pnl(entity_id, [("Period", start, end)])
-    return float(pnl["totals"]["net_profit"][0] or 0.0)
-
-def _pnl_net_income(entity_id: int, start: date, end: date) -> float:
-    """
-    Uses your P&L builder. It returns net_profit as a positive display number.
-    """
-    pnl = build_pnl(entity_id, [("Period", start, end)])
-    return float(pnl["totals"]["net_profit"][0] or 0.0)
-
 def _fy_start(d: date) -> date:
     # FY starts July 1. If month >= July => FY start is current year; else previous year.
     fy_year = d.year if d.month >= FISCAL_YEAR_START_MONTH else d.year - 1
     return date(fy_year, FISCAL_YEAR_START_MONTH, FISCAL_YEAR_START_DAY)
 
 
-def _retained_earnings_distributions(entity_id: int, as_of: date) -> float:
+def _retained_earnings_distributions(entity_id: int, start: date, as_ofs: List[date]) -> List[float]:
     """
     Distributions are postings to Retained Earnings accounts.
-    We calculate debit-positive / credit-negative activity through as_of.
+    We calculate debit-positive / credit-negative activity from start through each
+    as_of, for all as_of dates in one grouped query.
     In your data, these are typically DEBITS, so expect positive values.
     """
+    bounds = period_bounds([(start, as_of) for as_of in as_ofs])
+
     net_expr = func.sum(
         case(
-            (TransactionLine.is_debit.is_(True), TransactionLine.amount),
-            else_=-TransactionLine.amount,
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
         )
     )
 
-    val = (
-        db.session.query(net_expr)
+    q = (
+        report_session().query(bounds.c.period_idx.label("period_idx"), net_expr.label("net_activity"))
         .select_from(Account)
         .join(TransactionLine, TransactionLine.account_id == Account.id)
         .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .join(
+            bounds,
+            (Transaction.date >= bounds.c.start_date) & (Transaction.date <= bounds.c.end_date),
+        )
         .filter(Account.entity_id == entity_id)
         .filter(Transaction.entity_id == entity_id)
         .filter(Account.type == "Equity")
         .filter(Account.name.ilike("%retained earnings%"))
-        .filter(Transaction.date <= as_of)
-        .scalar()
+        .group_by(bounds.c.period_idx)
     )
 
-    return float(val or 0.0)
+    out = [0.0] * len(as_ofs)
+    for r in q.all():
+        out[int(r.period_idx)] = from_cents(r.net_activity)
+    return out
 
 
 def build_balance_sheet(entity_id: int, cols: list[tuple[str, date]]) -> dict:
@@ -285,81 +249,81 @@ def build_balance_sheet(entity_id: int, cols: list[tuple[str, date]]) -> dict:
         raise ValueError("cols must not be empty")
 
     n = len(cols)
-    trees: dict[str, Node] = {sec: Node(sec) for sec in SECTION_ORDER}
 
     min_d = _min_transaction_date(entity_id)
 
-    for col_idx, (_, as_of) in enumerate(cols):
-        # 1) Load all BS accounts as-of and populate trees,
-        #    EXCEPT Retained Earnings accounts (we treat those as distributions bucket).
-        rows = _query_asof_net_activity(entity_id, as_of)
-
-        for acct_type, acct_name, net in rows:
-            section = TYPE_TO_SECTION.get(acct_type)
-            if not section:
-                continue
-
-            # Skip any actual "Retained Earnings" equity accounts to avoid double-counting
-            if acct_type == "Equity" and "retained earnings" in (acct_name or "").lower():
-                continue
-
-            display_amt = _bs_display_amount(acct_type, net)
-
-            group = TYPE_TO_GROUP.get(acct_type, acct_type)
-            acct_path = [group] + _parse_path(acct_name)
-
-            _add_amount(trees[section], acct_path, col_idx, display_amt, n)
-
-        # 2) Inject computed Retained Earnings + Net Income
-        if min_d:
+    # 1) Load all BS accounts as-of for every column,
+    #    EXCEPT Retained Earnings accounts (the layout leaves them out; we treat
+    #    those as distributions bucket).
+    activity = [
+        (col_idx, account_id, net)
+        for col_idx, (_, as_of) in enumerate(cols)
+        for account_id, net in _query_asof_net_activity(entity_id, as_of)
+    ]
+
+    # Accounts are parsed and placed once per entity (services.account_hierarchy)
+    hier = get_account_hierarchy(entity_id, {account_id for _, account_id, _ in activity})
+    tree = hier.layout("balance_sheet", _bs_tree)
+    amounts = TreeAmounts(tree, n)
+
+    placed = [
+        (tree.account_nodes[account_id], col_idx, _bs_display_amount(hier.accounts[account_id].type, net))
+        for col_idx, account_id, net in activity
+        if account_id in tree.account_nodes
+    ]
+    if placed:
+        amounts.add_many(*zip(*placed))
+
+    # 2) Inject computed Retained Earnings + Net Income, batched across all columns:
+    #    one net-income query for every (prior FY, current FY) range and one
+    #    distributions query for every as_of.
+    if min_d:
+        ranges: list[tuple[date, date]] = []
+        prior_idx: list[int | None] = []
+        current_idx: list[int] = []
+
+        for _, as_of in cols:
             fy_start = _fy_start(as_of)
             day_before_fy = fy_start - timedelta(days=1)
 
-            prior_net_income = 0.0
             if day_before_fy >= min_d:
-                prior_net_income = _pnl_net_income(entity_id, min_d, day_before_fy)
+                prior_idx.append(len(ranges))
+                ranges.append((min_d, day_before_fy))
+            else:
+                prior_idx.append(None)
 
-            current_net_income = _pnl_net_income(entity_id, fy_start, as_of)
+            current_idx.append(len(ranges))
+            ranges.append((fy_start, as_of))
 
-            distributions = _retained_earnings_distributions(entity_id, as_of)
+        net_incomes = net_income_for_ranges(entity_id, ranges)
+        distributions = _retained_earnings_distributions(entity_id, min_d, [as_of for _, as_of in cols])
 
-            retained_earnings = prior_net_income - distributions
+        for col_idx in range(n):
+            p_idx = prior_idx[col_idx]
+            prior_net_income = net_incomes[p_idx] if p_idx is not None else 0.0
+            current_net_income = net_incomes[current_idx[col_idx]]
+
+            retained_earnings = prior_net_income - distributions[col_idx]
 
             # Put both under Equity -> Shareholders' equity
-            _add_amount(
-                trees["Equity"],
-                ["Shareholders' equity", "Retained Earnings"],
-                col_idx,
-                retained_earnings,
-                n,
-            )
-
-            _add_amount(
-                trees["Equity"],
-                ["Shareholders' equity", "Net Income"],
-                col_idx,
-                current_net_income,
-                n,
-            )
+            amounts.add(tree.node("Equity", RETAINED_EARNINGS_PATH), col_idx, retained_earnings)
+            amounts.add(tree.node("Equity", NET_INCOME_PATH), col_idx, current_net_income)
 
     # Roll up and flatten
     out_sections: list[dict] = []
     section_totals: dict[str, list[float]] = {}
 
-    for sec in SECTION_ORDER:
-        _rollup(trees[sec], n)
-        root = trees[sec]
+    amounts.rollup()
 
-        sec_rows: list[dict] = []
-        for key in sorted(root.children.keys()):
-            sec_rows.extend(_flatten(root.children[key], base_path=[], level=0, n_cols=n))
+    for sec in SECTION_ORDER:
+        sec_rows = amounts.flatten(sec, "cols")
 
-        section_totals[sec] = root.total[:n]
+        section_totals[sec] = amounts.section_total(sec)
         out_sections.append({
             "section": sec,
             "rows": sec_rows,
-            "section_totals": root.total[:n],
-            "section_total": sum(root.total[:n]),
+            "section_totals": amounts.section_total(sec),
+            "section_total": sum(section_totals[sec]),
         })
 
     assets = section_totals.get("Assets", [0.0] * n)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple
+from datetime import date
+from typing import Iterator, List, Optional, Set
 
 import pandas as pd
 
@@ -26,66 +26,96 @@ class CsvTransaction:
     lines: List[CsvLine]
 
 
-def _parse_date(d: str) -> date:
-    # Banktivity export format: dd/mm/YYYY
-    return datetime.strptime(str(d), "%d/%m/%Y").date()
+REQUIRED_COLUMNS = ["TRN_NO", "DATE", "ACCOUNT", "AMOUNT", "TYPE", "PAYEE", "DETAILS"]
 
+# Banktivity export date format: dd/mm/YYYY
+DATE_FORMAT = "%d/%m/%Y"
 
-def parse_banktivity_csv(csv_path: str, start_date: Optional[date] = None) -> List[CsvTransaction]:
-    """Parse Banktivity Transactions CSV into grouped transactions (one per TRN_NO).
+DEFAULT_CHUNK_SIZE = 50_000
 
-    This importer is intentionally conservative:
-    - We only import the *bank-side* (asset account) line.
-    - Split/category lines (TYPE == '-split-') are ignored; you'll categorise later in-app.
+
+def _optional_strs(col: pd.Series) -> List[Optional[str]]:
+    return [str(v) if pd.notna(v) else None for v in col.tolist()]
+
+
+def iter_banktivity_csv(
+    csv_path: str,
+    start_date: Optional[date] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[CsvTransaction]:
+    """Yield the CSV's transactions (one per TRN_NO) in file order, `chunk_size` rows at a time.
+
+    Same rules as parse_banktivity_csv, without materializing the whole file: dates
+    are parsed per chunk with one pd.to_datetime call and rows are read column-wise
+    instead of through iterrows(). A TRN_NO keeps its first primary line in the file.
     """
-    df = pd.read_csv(csv_path)
-
-    required = ["TRN_NO", "DATE", "ACCOUNT", "AMOUNT", "TYPE", "PAYEE", "DETAILS"]
-    for col in required:
-        if col not in df.columns:
-            raise ValueError(f"Missing required column '{col}' in CSV")
-
-    df = df[df["TRN_NO"].notna()].copy()
-    df["TRN_NO"] = df["TRN_NO"].astype(int)
-    df["DATE"] = df["DATE"].apply(_parse_date)
-    df["AMOUNT"] = pd.to_numeric(df["AMOUNT"], errors="coerce").fillna(0.0)
-
-    if start_date:
-        df = df[df["DATE"] >= start_date].copy()
-
-    # Only keep the primary lines (bank account side). Banktivity exports splits as TYPE == '-split-'
-    df_main = df[df["TYPE"].astype(str).str.lower() != "-split-"].copy()
-
-    # Some exports repeat the primary line once per split; dedupe per TRN_NO keeping the first.
-    df_main.sort_values(["DATE", "TRN_NO"], inplace=True)
-    df_main = df_main.drop_duplicates(subset=["TRN_NO"], keep="first")
-
-    transactions: List[CsvTransaction] = []
-    for _, row in df_main.iterrows():
-        trn_no = int(row["TRN_NO"])
-        txn_date = row["DATE"]
-        acct = str(row["ACCOUNT"]).strip()
-        amt = float(row["AMOUNT"])
-        total_abs = abs(amt)
-
-        line = CsvLine(
-            csv_account_name=acct,
-            is_debit=amt > 0,  # deposits increase asset (debit); withdrawals decrease asset (credit)
-            amount=total_abs,
-            memo=str(row["DETAILS"]) if pd.notna(row["DETAILS"]) else None,
+    reader = pd.read_csv(
+        csv_path,
+        chunksize=chunk_size,
+        dtype={"ACCOUNT": str, "TYPE": str, "PAYEE": str, "DETAILS": str},
+    )
+    seen: Set[int] = set()
+
+    for df in reader:
+        for col in REQUIRED_COLUMNS:
+            if col not in df.columns:
+                raise ValueError(f"Missing required column '{col}' in CSV")
+
+        df = df[df["TRN_NO"].notna()]
+        if df.empty:
+            continue
+
+        df = df.assign(
+            TRN_NO=df["TRN_NO"].astype(int),
+            DATE=pd.to_datetime(df["DATE"].astype(str), format=DATE_FORMAT),
+            AMOUNT=pd.to_numeric(df["AMOUNT"], errors="coerce").fillna(0.0),
         )
 
-        transactions.append(
-            CsvTransaction(
-                trn_no=trn_no,
+        if start_date:
+            df = df[df["DATE"] >= pd.Timestamp(start_date)]
+
+        # Only keep the primary lines (bank account side). Banktivity exports splits as TYPE == '-split-'
+        df = df[df["TYPE"].astype(str).str.lower() != "-split-"]
+
+        # Some exports repeat the primary line once per split; keep the first per TRN_NO.
+        df = df[~df["TRN_NO"].isin(seen)].drop_duplicates(subset=["TRN_NO"], keep="first")
+        seen.update(df["TRN_NO"].tolist())
+
+        details = _optional_strs(df["DETAILS"])
+        for trn_no, txn_date, acct, amt, txn_type, payee, detail in zip(
+            df["TRN_NO"].tolist(),
+            df["DATE"].dt.date.tolist(),
+            df["ACCOUNT"].astype(str).str.strip().tolist(),
+            df["AMOUNT"].tolist(),
+            _optional_strs(df["TYPE"]),
+            _optional_strs(df["PAYEE"]),
+            details,
+        ):
+            total_abs = abs(float(amt))
+            line = CsvLine(
+                csv_account_name=acct,
+                is_debit=amt > 0,  # deposits increase asset (debit); withdrawals decrease asset (credit)
+                amount=total_abs,
+                memo=detail,
+            )
+            yield CsvTransaction(
+                trn_no=int(trn_no),
                 date=txn_date,
-                type=str(row["TYPE"]) if pd.notna(row["TYPE"]) else None,
-                payee=str(row["PAYEE"]) if pd.notna(row["PAYEE"]) else None,
-                details=str(row["DETAILS"]) if pd.notna(row["DETAILS"]) else None,
+                type=txn_type,
+                payee=payee,
+                details=detail,
                 total_abs=total_abs,
                 lines=[line],
             )
-        )
 
+
+def parse_banktivity_csv(csv_path: str, start_date: Optional[date] = None) -> List[CsvTransaction]:
+    """Parse Banktivity Transactions CSV into grouped transactions (one per TRN_NO).
+
+    This importer is intentionally conservative:
+    - We only import the *bank-side* (asset account) line.
+    - Split/category lines (TYPE == '-split-') are ignored; you'll categorise later in-app.
+    """
+    transactions = list(iter_banktivity_csv(csv_path, start_date=start_date))
     transactions.sort(key=lambda t: (t.date, t.trn_no))
     return transactions
@@ -0,0 +1,106 @@
+# FlaskApp/app/services/bulk_import.py
+# Bulk INSERTs (executemany per chunk) for imported transactions and their lines.
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import insert
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.services.transaction_numbers import (
+    allocate_transaction_numbers,
+    reserve_transaction_numbers,
+)
+from FlaskApp.app.utils.money import to_cents
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class ImportLine:
+    account_id: int
+    is_debit: bool
+    amount: float
+    memo: Optional[str] = None
+
+
+@dataclass
+class ImportTransaction:
+    transaction_id: Optional[int]  # None = next number from the entity's sequence
+    date: date
+    description: str = ""
+    transaction_type: Optional[str] = None
+    posted_at: Optional[datetime] = None
+    lines: List[ImportLine] = field(default_factory=list)
+
+
+def bulk_insert_transactions(
+    entity_id: int,
+    txns: Sequence[ImportTransaction],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[int]:
+    """Insert `txns` and their lines; returns the new Transaction pks in input order.
+
+    Transactions without a transaction_id are numbered from the entity's sequence in
+    one block. `progress(done, total)` is called after each chunk. Nothing is
+    committed here.
+    """
+    total = len(txns)
+    ids: List[int] = []
+    now = datetime.utcnow()
+
+    numbered = [int(t.transaction_id) for t in txns if t.transaction_id is not None]
+    reserve_transaction_numbers(entity_id, numbered)
+    unnumbered = [t for t in txns if t.transaction_id is None]
+    if unnumbered:
+        first = allocate_transaction_numbers(entity_id, len(unnumbered))
+        for i, t in enumerate(unnumbered):
+            t.transaction_id = first + i
+
+    for start in range(0, total, chunk_size):
+        chunk = txns[start:start + chunk_size]
+
+        txn_rows = [
+            {
+                "entity_id": entity_id,
+                "transaction_id": t.transaction_id,
+                "date": t.date,
+                "description": t.description,
+                "transaction_type": t.transaction_type,
+                "created_at": now,
+                "posted_at": t.posted_at or now,
+            }
+            for t in chunk
+        ]
+        chunk_ids = list(
+            db.session.scalars(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                txn_rows,
+            )
+        )
+
+        line_rows = [
+            {
+                "transaction_id": txn_pk,
+                "account_id": int(ln.account_id),
+                "is_debit": bool(ln.is_debit),
+                "amount_cents": to_cents(ln.amount),
+                "memo": ln.memo,
+                "created_at": now,
+            }
+            for txn_pk, t in zip(chunk_ids, chunk)
+            for ln in t.lines
+        ]
+        if line_rows:
+            db.session.execute(insert(TransactionLine), line_rows)
+
+        ids.extend(chunk_ids)
+        if progress:
+            progress(len(ids), total)
+
+    return ids
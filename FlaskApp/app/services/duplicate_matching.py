@@ -0,0 +1,58 @@
+# FlaskApp/app/services/duplicate_matching.py
+# Date + amount duplicate candidates for CSV imports, loaded in one query per import.
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, List, Set
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.utils.money import to_cents
+
+
+class DateAmountIndex:
+    """Existing line amounts (cents) per date, each tagged with its transaction ids."""
+
+    def __init__(self):
+        # date -> amount_cents -> {transaction pk}
+        self._by_date: Dict[date, Dict[int, Set[int]]] = {}
+        self.descriptions: Dict[int, str] = {}
+
+    def add_cents(self, d: date, amount_cents: int, txn_id: int, description: str = "") -> None:
+        self._by_date.setdefault(d, {}).setdefault(int(amount_cents), set()).add(int(txn_id))
+        self.descriptions.setdefault(int(txn_id), description or "")
+
+    def add(self, d: date, amount: float, txn_id: int, description: str = "") -> None:
+        self.add_cents(d, to_cents(amount), txn_id, description)
+
+    def match_ids(self, d: date, amount: float) -> List[int]:
+        """Transaction pks dated `d` with a line of exactly `amount` (ascending)."""
+        cents = to_cents(amount)
+        if cents <= 0:
+            return []
+        return sorted(self._by_date.get(d, {}).get(cents, ()))
+
+    def matches(self, d: date, amount: float) -> List[dict]:
+        return [{"id": tid, "description": self.descriptions.get(tid, "")} for tid in self.match_ids(d, amount)]
+
+
+def load_date_amount_index(entity_id: int, dates: Iterable[date]) -> DateAmountIndex:
+    """One query for all of the entity's line amounts between min(dates) and max(dates)."""
+    index = DateAmountIndex()
+    dates = [d for d in dates if d is not None]
+    if not dates:
+        return index
+
+    rows = (
+        db.session.query(Transaction.id, Transaction.date, Transaction.description, TransactionLine.amount_cents)
+        .join(TransactionLine, TransactionLine.transaction_id == Transaction.id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(Transaction.date.between(min(dates), max(dates)))
+        .all()
+    )
+    wanted = set(dates)
+    for txn_id, d, description, amount_cents in rows:
+        if d in wanted:
+            index.add_cents(d, amount_cents, txn_id, description)
+    return index
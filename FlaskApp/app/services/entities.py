@@ -1,13 +1,123 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from flask import session
 from sqlalchemy.exc import IntegrityError
+
 from FlaskApp.app.accounting_db import db
 from FlaskApp.app.models.entity import Entity
 
-def get_entities():
-    return (
-        db.session.query(Entity)
+SESSION_ENTITY_KEY = "current_entity"
+SESSION_ENTITY_ID_KEY = "current_entity_id"
+
+# Per-process entity registry: reloaded by create_entity, on a lookup miss
+# (an entity created by another worker) and at most this long after the last load
+ENTITY_CACHE_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class EntityInfo:
+    id: int
+    name: str
+    type: Optional[str] = None
+    description: Optional[str] = None
+
+
+class _Registry:
+    def __init__(self, entities: List[EntityInfo]):
+        self.loaded_at = time.monotonic()
+        self.entities = entities
+        self.by_id: Dict[int, EntityInfo] = {e.id: e for e in entities}
+        self.by_name: Dict[str, EntityInfo] = {}
+        for e in entities:
+            self.by_name.setdefault(e.name, e)  # names repeat across types: lowest id wins
+
+
+_lock = threading.Lock()
+_registry: Optional[_Registry] = None
+
+
+def _load_registry() -> _Registry:
+    global _registry
+    rows = (
+        db.session.query(Entity.id, Entity.name, Entity.type, Entity.description)
         .order_by(Entity.id)
         .all()
     )
+    reg = _Registry([EntityInfo(int(r.id), r.name, r.type, r.description) for r in rows])
+    with _lock:
+        _registry = reg
+    return reg
+
+
+def _get_registry() -> _Registry:
+    with _lock:
+        reg = _registry
+    if reg is None or time.monotonic() - reg.loaded_at > ENTITY_CACHE_TTL_SECONDS:
+        reg = _load_registry()
+    return reg
+
+
+def clear_entity_cache() -> None:
+    global _registry
+    with _lock:
+        _registry = None
+
+
+def get_entities() -> List[EntityInfo]:
+    return list(_get_registry().entities)
+
+
+def get_entity_by_id(entity_id: int) -> Optional[EntityInfo]:
+    entity_id = int(entity_id)
+    ent = _get_registry().by_id.get(entity_id)
+    if ent is None:
+        ent = _load_registry().by_id.get(entity_id)
+    return ent
+
+
+def get_entity_by_name(name: str) -> Optional[EntityInfo]:
+    if not name:
+        return None
+    ent = _get_registry().by_name.get(name)
+    if ent is None:
+        ent = _load_registry().by_name.get(name)
+    return ent
+
+
+def set_session_entity(ent) -> None:
+    """Make `ent` (an Entity or EntityInfo) the session's current entity."""
+    session[SESSION_ENTITY_KEY] = ent.name
+    session[SESSION_ENTITY_ID_KEY] = ent.id
+
+
+def session_entity_id() -> Optional[int]:
+    """
+    Id of the session's current entity, or None if there is none or it no longer
+    exists. The id is stored in the session the first time it is resolved from
+    the name.
+    """
+    name = session.get(SESSION_ENTITY_KEY)
+    if not name:
+        return None
+
+    entity_id = session.get(SESSION_ENTITY_ID_KEY)
+    if entity_id is not None:
+        ent = _get_registry().by_id.get(int(entity_id))
+        if ent is not None and ent.name == name:
+            return ent.id
+
+    ent = get_entity_by_name(name)
+    if ent is None:
+        session.pop(SESSION_ENTITY_ID_KEY, None)
+        return None
+    set_session_entity(ent)
+    return ent.id
+
 
 def create_entity(name: str, type_: str | None = None, description: str | None = None) -> Entity:
     """Create a new Entity row and commit.
@@ -23,4 +133,5 @@ def create_entity(name: str, type_: str | None = None, description: str | None =
     ent = Entity(name=name, type=(type_ or None), description=(description or None))
     db.session.add(ent)
     db.session.commit()
+    clear_entity_cache()
     return ent
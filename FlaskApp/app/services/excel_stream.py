@@ -0,0 +1,94 @@
+# FlaskApp/app/services/excel_stream.py
+# Write-only report workbooks with shared named styles, streamed to the response in chunks.
+from __future__ import annotations
+
+import tempfile
+from io import BytesIO
+from typing import Iterator, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+AUD_ACCOUNTING_FMT = '_("$"* #,##0.00_);_("$"* (#,##0.00);_("$"* "-"??_);_(@_)'
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Named styles shared by every report cell
+BOLD = "Report Bold"
+HEADER = "Report Header"
+MONEY = "Report Money"
+MONEY_BOLD = "Report Money Bold"
+
+
+def new_report_workbook(title: str) -> tuple[Workbook, WriteOnlyWorksheet]:
+    """A write-only workbook with the report named styles and one sheet `title`."""
+    wb = Workbook(write_only=True)
+
+    bold = NamedStyle(name=BOLD, font=Font(bold=True))
+    header = NamedStyle(name=HEADER, font=Font(bold=True), alignment=Alignment(horizontal="center"))
+    money = NamedStyle(name=MONEY, number_format=AUD_ACCOUNTING_FMT)
+    money_bold = NamedStyle(name=MONEY_BOLD, font=Font(bold=True), number_format=AUD_ACCOUNTING_FMT)
+    for style in (bold, header, money, money_bold):
+        wb.add_named_style(style)
+
+    return wb, wb.create_sheet(title)
+
+
+def styled(ws: WriteOnlyWorksheet, value, style: Optional[str] = None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    if style:
+        cell.style = style
+    return cell
+
+
+def label_cell(ws: WriteOnlyWorksheet, label: str, level: int = 0, bold: bool = False) -> WriteOnlyCell:
+    """Row label indented by `level` (one named style per level/weight, created on first use)."""
+    if not level:
+        return styled(ws, label, BOLD if bold else None)
+
+    name = f"Report Label {level}{' Bold' if bold else ''}"
+    wb = ws.parent
+    if name not in wb.named_styles:
+        wb.add_named_style(
+            NamedStyle(name=name, font=Font(bold=bold), alignment=Alignment(indent=level * 2))
+        )
+    return styled(ws, label, name)
+
+
+def money_cell(ws: WriteOnlyWorksheet, val: float, bold: bool = False) -> WriteOnlyCell:
+    return styled(ws, float(val or 0.0), MONEY_BOLD if bold else MONEY)
+
+
+def stream_workbook(wb: Workbook, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Save `wb` to a temporary file now (so errors surface in the view) and return an
+    iterator over its bytes, for a streamed Response. The file is removed once the
+    iterator is exhausted or closed.
+    """
+    tmp = tempfile.TemporaryFile()
+    try:
+        wb.save(tmp)
+        tmp.seek(0)
+    except Exception:
+        tmp.close()
+        raise
+
+    def chunks() -> Iterator[bytes]:
+        with tmp:
+            while True:
+                data = tmp.read(chunk_size)
+                if not data:
+                    break
+                yield data
+
+    return chunks()
+
+
+def workbook_to_bytes(wb: Workbook) -> bytes:
+    bio = BytesIO()
+    wb.save(bio)
+    return bio.getvalue()
@@ -0,0 +1,240 @@
+# FlaskApp/app/services/general_ledger_export.py
+# General-ledger detail export: every transaction line, grouped by account, with running balances.
+from __future__ import annotations
+
+import csv
+import itertools
+from datetime import date
+from io import StringIO
+from typing import Iterator, NamedTuple, Optional
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from sqlalchemy import case, func
+
+from FlaskApp.app.accounting_db import report_session
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.services.account_ledger import is_debit_normal
+from FlaskApp.app.services.excel_stream import BOLD, HEADER, money_cell, new_report_workbook, styled
+from FlaskApp.app.utils.money import from_cents
+
+GL_COLUMNS = ["Account", "Type", "Date", "Transaction", "Description", "Memo", "Debit", "Credit", "Balance"]
+
+DEFAULT_BATCH_SIZE = 2000
+
+GL_COLUMN_WIDTHS = [40, 20, 12, 12, 50, 40, 16, 16, 16]
+
+
+class GLRow(NamedTuple):
+    kind: str  # "opening", "line" or "total"
+    account: str
+    type: str
+    date: Optional[date]
+    transaction: Optional[int]
+    description: str
+    memo: str
+    debit: Optional[float]
+    credit: Optional[float]
+    balance: float
+
+
+def _opening_balances(entity_id: int, start_date: Optional[date]) -> dict:
+    """account_id -> debit-positive net cents of everything dated before start_date."""
+    if not start_date:
+        return {}
+
+    net_expr = func.sum(
+        case(
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
+        )
+    )
+    rows = (
+        report_session().query(TransactionLine.account_id, net_expr)
+        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(Transaction.date < start_date)
+        .group_by(TransactionLine.account_id)
+        .all()
+    )
+    return {int(account_id): int(net or 0) for account_id, net in rows}
+
+
+def _opening_row(name: str, acct_type: str, start_date: date, balance_cents: int) -> GLRow:
+    return GLRow("opening", name, acct_type, start_date, None, "Opening Balance", "", None, None, from_cents(balance_cents))
+
+
+def iter_general_ledger(
+    entity_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[GLRow]:
+    """
+    Yield general-ledger rows for an entity, account by account (by name). Lines
+    are read `batch_size` at a time, so memory does not grow with the export.
+    """
+    accounts = (
+        report_session().query(Account.id, Account.name, Account.type)
+        .filter(Account.entity_id == entity_id)
+        .order_by(Account.name, Account.id)
+        .all()
+    )
+    opening = _opening_balances(entity_id, start_date)
+
+    q = (
+        report_session().query(
+            TransactionLine.account_id,
+            Transaction.date,
+            Transaction.transaction_id,
+            Transaction.description,
+            TransactionLine.memo,
+            TransactionLine.is_debit,
+            TransactionLine.amount_cents,
+        )
+        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .join(Account, Account.id == TransactionLine.account_id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(Account.entity_id == entity_id)
+    )
+    if start_date:
+        q = q.filter(Transaction.date >= start_date)
+    if end_date:
+        q = q.filter(Transaction.date <= end_date)
+    q = q.order_by(
+        Account.name, Account.id, Transaction.date, Transaction.created_at, Transaction.id, TransactionLine.id
+    ).yield_per(batch_size)
+
+    # Lines arrive in the same account order as `accounts`
+    groups = itertools.groupby(q, key=lambda r: r.account_id)
+    group = next(groups, None)
+
+    for account_id, name, acct_type in accounts:
+        sign = 1 if is_debit_normal(acct_type) else -1
+        balance = sign * opening.get(account_id, 0)
+
+        lines = ()
+        if group is not None and group[0] == account_id:
+            lines = group[1]
+
+        first = True
+        debits = credits = 0
+        for ln in lines:
+            if first and start_date:
+                yield _opening_row(name, acct_type, start_date, balance)
+            first = False
+
+            cents = int(ln.amount_cents)
+            if ln.is_debit:
+                debits += cents
+                balance += sign * cents
+            else:
+                credits += cents
+                balance -= sign * cents
+            yield GLRow(
+                "line",
+                name,
+                acct_type,
+                ln.date,
+                ln.transaction_id,
+                ln.description or "",
+                ln.memo or "",
+                from_cents(cents) if ln.is_debit else None,
+                None if ln.is_debit else from_cents(cents),
+                from_cents(balance),
+            )
+
+        if lines:
+            group = next(groups, None)
+        elif not balance:
+            continue  # no activity and nothing brought forward
+        elif start_date:
+            yield _opening_row(name, acct_type, start_date, balance)
+
+        yield GLRow(
+            "total",
+            name,
+            acct_type,
+            end_date,
+            None,
+            f"Total {name}",
+            "",
+            from_cents(debits),
+            from_cents(credits),
+            from_cents(balance),
+        )
+
+
+def iter_general_ledger_csv(rows: Iterator[GLRow], rows_per_chunk: int = 500) -> Iterator[str]:
+    """CSV text in chunks of `rows_per_chunk` rows, header first."""
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(GL_COLUMNS)
+
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(
+            [
+                row.account,
+                row.type,
+                row.date.isoformat() if row.date else "",
+                "" if row.transaction is None else row.transaction,
+                row.description,
+                row.memo,
+                "" if row.debit is None else f"{row.debit:.2f}",
+                "" if row.credit is None else f"{row.credit:.2f}",
+                f"{row.balance:.2f}",
+            ]
+        )
+        if i % rows_per_chunk == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def build_general_ledger_workbook(
+    rows: Iterator[GLRow], entity_name: str, subtitle: str
+) -> Workbook:
+    """Write-only workbook (see services.excel_stream); rows are appended as they stream."""
+    wb, ws = new_report_workbook("General Ledger")
+
+    for i, width in enumerate(GL_COLUMN_WIDTHS, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    ws.append([styled(ws, entity_name, BOLD)])
+    ws.append([styled(ws, "General Ledger", BOLD)])
+    ws.append([subtitle])
+    ws.append([])
+    ws.append([styled(ws, c, HEADER) for c in GL_COLUMNS])
+
+    for row in rows:
+        is_total = row.kind == "total"
+        ws.append(
+            [
+                row.account,
+                row.type,
+                row.date,
+                row.transaction,
+                styled(ws, row.description, BOLD) if is_total else row.description,
+                row.memo or None,
+                None if row.debit is None else money_cell(ws, row.debit, is_total),
+                None if row.credit is None else money_cell(ws, row.credit, is_total),
+                money_cell(ws, row.balance, is_total),
+            ]
+        )
+
+    return wb
+
+
+def general_ledger_subtitle(start_date: Optional[date], end_date: Optional[date]) -> str:
+    if start_date and end_date:
+        return f"{start_date.strftime('%B %d, %Y')} - {end_date.strftime('%B %d, %Y')}"
+    if start_date:
+        return f"From {start_date.strftime('%B %d, %Y')}"
+    if end_date:
+        return f"Through {end_date.strftime('%B %d, %Y')}"
+    return "All dates"
@@ -0,0 +1,148 @@
+# FlaskApp/app/services/import_sessions.py
+# Server-side CSV import sessions: an upload is parsed once and pickled under IMPORT_SESSION_DIR.
+from __future__ import annotations
+
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import IO, List, Optional, Union
+
+from flask import current_app
+
+import FlaskApp.app.common as common
+from FlaskApp.app.services.banktivity_import import CsvTransaction, parse_banktivity_csv
+
+DEFAULT_MAX_AGE_HOURS = 48
+MEMORY_CACHE_SIZE = 4
+
+_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_lock = threading.Lock()
+_recent: "OrderedDict[str, ImportSession]" = OrderedDict()
+
+
+@dataclass
+class ImportSession:
+    import_id: str
+    entity_id: int
+    source: str
+    csv_name: str
+    created_at: datetime
+    transactions: List[CsvTransaction] = field(default_factory=list)
+
+    def transactions_from(self, start_date: Optional[date] = None) -> List[CsvTransaction]:
+        """The parsed transactions (sorted by date, TRN_NO), optionally from start_date on."""
+        if not start_date:
+            return list(self.transactions)
+        return [t for t in self.transactions if t.date >= start_date]
+
+
+def _session_dir() -> str:
+    path = current_app.config.get("IMPORT_SESSION_DIR") or os.path.join(current_app.root_path, "tmp")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _session_path(import_id: str) -> str:
+    return os.path.join(_session_dir(), f"import_{import_id}.pkl")
+
+
+def _max_age_seconds() -> float:
+    return float(current_app.config.get("IMPORT_SESSION_MAX_AGE_HOURS", DEFAULT_MAX_AGE_HOURS)) * 3600
+
+
+def _remember(imp: ImportSession) -> None:
+    with _lock:
+        _recent[imp.import_id] = imp
+        _recent.move_to_end(imp.import_id)
+        while len(_recent) > MEMORY_CACHE_SIZE:
+            _recent.popitem(last=False)
+
+
+def purge_expired_import_sessions() -> int:
+    """Delete session files older than the max age; returns how many were removed."""
+    cutoff = time.time() - _max_age_seconds()
+    removed = 0
+    directory = _session_dir()
+    for name in os.listdir(directory):
+        if not (name.startswith("import_") and name.endswith(".pkl")):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def create_import_session(
+    entity_id: int,
+    csv_file: Union[str, IO],
+    csv_name: str,
+    source: str = "banktivity",
+) -> ImportSession:
+    """Parse an uploaded CSV (path or file object) once and persist the result."""
+    purge_expired_import_sessions()
+
+    imp = ImportSession(
+        import_id=uuid.uuid4().hex,
+        entity_id=int(entity_id),
+        source=source,
+        csv_name=os.path.basename(csv_name or "upload.csv"),
+        created_at=datetime.utcnow(),
+        transactions=parse_banktivity_csv(csv_file),
+    )
+
+    # Write to a temp file first so a concurrent load never sees a partial pickle
+    fd, tmp_path = tempfile.mkstemp(dir=_session_dir(), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(imp, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, _session_path(imp.import_id))
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _remember(imp)
+    common.logger.info(
+        f"Import session {imp.import_id}: {len(imp.transactions)} transaction(s) from {imp.csv_name}"
+    )
+    return imp
+
+
+def load_import_session(import_id: str, entity_id: int) -> Optional[ImportSession]:
+    """The entity's import session, or None if the id is unknown, expired or foreign."""
+    if not import_id or not _ID_RE.match(import_id):
+        return None
+
+    with _lock:
+        imp = _recent.get(import_id)
+        if imp is not None:
+            _recent.move_to_end(import_id)
+
+    path = _session_path(import_id)
+    try:
+        if time.time() - os.path.getmtime(path) > _max_age_seconds():
+            return None
+        if imp is None:
+            with open(path, "rb") as fh:
+                imp = pickle.load(fh)
+            _remember(imp)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if int(imp.entity_id) != int(entity_id):
+        return None
+    return imp
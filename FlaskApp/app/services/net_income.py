@@ -0,0 +1,59 @@
+# FlaskApp/app/services/net_income.py
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import case, func
+
+from FlaskApp.app.accounting_db import report_session
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.services.pnl_report import PNL_TYPES
+from FlaskApp.app.services.report_periods import period_bounds
+from FlaskApp.app.utils.money import from_cents
+
+
+def net_income_for_ranges(entity_id: int, ranges: List[Tuple[date, date]]) -> List[float]:
+    """
+    Net income for each (start, end) range, in one grouped query.
+
+    Returned as a *positive display* number, i.e. identical to
+    build_pnl(...)["totals"]["net_profit"] for that range: income is credit-normal, so
+    net income = -(sum(debits) - sum(credits)) over all P&L-typed accounts.
+    """
+    if not ranges:
+        return []
+
+    bounds = period_bounds(ranges)
+
+    net_expr = func.sum(
+        case(
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
+        )
+    )
+
+    q = (
+        report_session().query(
+            bounds.c.period_idx.label("period_idx"),
+            net_expr.label("net_activity"),
+        )
+        .select_from(Account)
+        .join(TransactionLine, TransactionLine.account_id == Account.id)
+        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .join(
+            bounds,
+            (Transaction.date >= bounds.c.start_date) & (Transaction.date <= bounds.c.end_date),
+        )
+        .filter(Account.entity_id == entity_id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(Account.type.in_(PNL_TYPES))
+        .group_by(bounds.c.period_idx)
+    )
+
+    out = [0.0] * len(ranges)
+    for r in q.all():
+        out[int(r.period_idx)] = -from_cents(r.net_activity)
+    return out
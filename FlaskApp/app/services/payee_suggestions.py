@@ -0,0 +1,141 @@
+# FlaskApp/app/services/payee_suggestions.py
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.payee_account_count import PayeeAccountCount
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.services.balance_sheet_report import ASSET_TYPES
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def payee_tokens(text: Optional[str]) -> List[str]:
+    """
+    Normalized tokens of a payee/description: lowercased alphanumeric words of two
+    or more characters, excluding pure numbers (dates, card and reference numbers).
+    Only the first 64 characters are considered, as for the CSV payee term.
+    """
+    seen: Dict[str, None] = {}
+    for tok in _TOKEN_RE.findall((text or "").lower()[:64]):
+        if len(tok) >= 2 and not tok.isdigit():
+            seen.setdefault(tok, None)
+    return list(seen)
+
+
+def _count_transactions(txn_ids: Iterable[int]) -> Counter:
+    """(token, account_id) -> number of lines, over the current DB state of `txn_ids`."""
+    txn_ids = {int(t) for t in txn_ids if t}
+    counts: Counter = Counter()
+    if not txn_ids:
+        return counts
+
+    rows = (
+        db.session.query(Transaction.description, TransactionLine.account_id)
+        .join(TransactionLine, TransactionLine.transaction_id == Transaction.id)
+        .filter(Transaction.id.in_(txn_ids))
+        .all()
+    )
+    for description, account_id in rows:
+        for tok in payee_tokens(description):
+            counts[(tok, int(account_id))] += 1
+    return counts
+
+
+def update_payee_index(entity_id: int, txn_ids: Iterable[int], delta: int = 1) -> None:
+    """
+    Add (delta=1) or remove (delta=-1) the given transactions' contribution to the
+    payee index, reading their current description and lines from the session.
+
+    Remove before a transaction is changed or deleted, add after it has been
+    flushed; both before commit, so the index is committed with the transactions.
+    """
+    counts = _count_transactions(txn_ids)
+    if not counts:
+        return
+
+    tokens = {tok for tok, _ in counts}
+    existing = {
+        (r.token, int(r.account_id)): r
+        for r in (
+            db.session.query(PayeeAccountCount)
+            .filter(PayeeAccountCount.entity_id == entity_id)
+            .filter(PayeeAccountCount.token.in_(tokens))
+            .all()
+        )
+    }
+
+    new_rows = []
+    for (tok, account_id), n in counts.items():
+        row = existing.get((tok, account_id))
+        if row is None:
+            if delta > 0:
+                new_rows.append({"entity_id": entity_id, "token": tok, "account_id": account_id, "count": n * delta})
+            continue
+        row.count = int(row.count) + n * delta
+        if row.count <= 0:
+            db.session.delete(row)
+
+    if new_rows:
+        db.session.execute(insert(PayeeAccountCount), new_rows)
+
+
+def rebuild_payee_index(entity_id: int) -> None:
+    """Recompute the payee index for every transaction of an entity."""
+    db.session.query(PayeeAccountCount).filter(PayeeAccountCount.entity_id == entity_id).delete(
+        synchronize_session=False
+    )
+    txn_ids = [tid for (tid,) in db.session.query(Transaction.id).filter(Transaction.entity_id == entity_id)]
+    update_payee_index(entity_id, txn_ids, delta=1)
+
+
+def suggest_accounts(entity_id: int, terms: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    Most likely non-asset counterparty account for each payee term, from one query.
+
+    Accounts are ranked by how many of the term's tokens they have been seen with,
+    then by the smallest of those per-token counts (an estimate of how many lines
+    matched the whole term). Returns term -> {"account_id", "account_name", "count"}
+    or None when nothing matches.
+    """
+    term_tokens = {term: payee_tokens(term) for term in terms}
+    all_tokens = {tok for toks in term_tokens.values() for tok in toks}
+    if not all_tokens:
+        return {term: None for term in term_tokens}
+
+    by_token: Dict[str, List[Tuple[int, str, int]]] = {}
+    for tok, account_id, account_name, count in (
+        db.session.query(PayeeAccountCount.token, Account.id, Account.name, PayeeAccountCount.count)
+        .join(Account, Account.id == PayeeAccountCount.account_id)
+        .filter(PayeeAccountCount.entity_id == entity_id)
+        .filter(PayeeAccountCount.token.in_(all_tokens))
+        .filter(Account.entity_id == entity_id)
+        .filter(~Account.type.in_(ASSET_TYPES))
+        .all()
+    ):
+        by_token.setdefault(tok, []).append((int(account_id), account_name, int(count)))
+
+    suggestions: Dict[str, Optional[dict]] = {}
+    for term, toks in term_tokens.items():
+        scores: Dict[int, List] = {}  # account_id -> [matched tokens, min count, name]
+        for tok in toks:
+            for account_id, account_name, count in by_token.get(tok, []):
+                s = scores.setdefault(account_id, [0, count, account_name])
+                s[0] += 1
+                s[1] = min(s[1], count)
+
+        if not scores:
+            suggestions[term] = None
+            continue
+
+        account_id, (_, count, account_name) = max(scores.items(), key=lambda kv: (kv[1][0], kv[1][1]))
+        suggestions[term] = {"account_id": account_id, "account_name": account_name, "count": count}
+
+    return suggestions
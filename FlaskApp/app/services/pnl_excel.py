@@ -2,122 +2,86 @@
 from __future__ import annotations
 
 from datetime import datetime
-from io import BytesIO
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, numbers
 from openpyxl.utils import get_column_letter
 
+from FlaskApp.app.services.excel_stream import (
+    BOLD,
+    HEADER,
+    label_cell,
+    money_cell,
+    new_report_workbook,
+    styled,
+)
 
-def build_pnl_workbook(pnl: Dict[str, Any], entity_name: str, subtitle: str) -> Workbook:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Profit and Loss"
-
-    bold = Font(bold=True)
-    money_fmt = '_("$"* #,##0.00_);_("$"* (#,##0.00);_("$"* "-"??_);_(@_)'
 
+def pnl_subtitle(periods) -> str:
+    """Title range like "July 2023 - June 2025" for [(label, start, end), ...]."""
+    return f"{periods[0][1].strftime('%B %Y')} - {periods[-1][2].strftime('%B %Y')}"
 
-    # Title
-    ws["A1"] = entity_name
-    ws["A1"].font = bold
-    ws["A2"] = "Profit and Loss"
-    ws["A2"].font = bold
-    ws["A3"] = subtitle
 
-    # Headers
-    header_row = 5
-    ws.cell(header_row, 1).value = ""  # labels column
-    ws.cell(header_row, 1).font = bold
+def build_pnl_workbook(pnl: Dict[str, Any], entity_name: str, subtitle: str) -> Workbook:
+    """Write-only workbook (see services.excel_stream); it can be saved once."""
+    wb, ws = new_report_workbook("Profit and Loss")
 
     periods = pnl["periods"]
     n = len(periods)
+    total_col = 2 + n
 
-    for i, p in enumerate(periods, start=2):
-        c = ws.cell(header_row, i)
-        c.value = p["label"]
-        c.font = bold
-        c.alignment = Alignment(horizontal="center")
+    # Column widths (must be set before the first row in write-only mode)
+    ws.column_dimensions["A"].width = 50
+    for c in range(2, total_col + 1):
+        ws.column_dimensions[get_column_letter(c)].width = 18
 
-    total_col = 2 + n
-    ws.cell(header_row, total_col).value = "Total"
-    ws.cell(header_row, total_col).font = bold
-    ws.cell(header_row, total_col).alignment = Alignment(horizontal="center")
+    def amounts(vec: List[float], total: float, is_bold: bool = False) -> list:
+        return [money_cell(ws, v, is_bold) for v in vec] + [money_cell(ws, total, is_bold)]
 
-    # Helpers
-    def write_amount(r: int, c: int, val: float, is_bold: bool = False):
-        cell = ws.cell(r, c)
-        cell.value = float(val or 0.0)
-        cell.number_format = money_fmt
-        if is_bold:
-            cell.font = bold
+    # Title
+    ws.append([styled(ws, entity_name, BOLD)])
+    ws.append([styled(ws, "Profit and Loss", BOLD)])
+    ws.append([subtitle])
+    ws.append([])
 
-    r = header_row + 1
+    # Headers
+    ws.append(
+        [styled(ws, "", BOLD)]
+        + [styled(ws, p["label"], HEADER) for p in periods]
+        + [styled(ws, "Total", HEADER)]
+    )
 
     # Sections
     for sec in pnl["sections"]:
-        ws.cell(r, 1).value = sec["section"]
-        ws.cell(r, 1).font = bold
-        r += 1
+        ws.append([styled(ws, sec["section"], BOLD)])
 
         for row in sec["rows"]:
-            level = int(row["level"])
             kind = row["kind"]
-            label = row["label"]
-            vec = row["periods"]
-            row_total = row["row_total"]
-
             is_total = (kind == "total")
             is_group = (kind == "group")
 
-            label_cell = ws.cell(r, 1)
-            label_cell.value = label
-            label_cell.alignment = Alignment(indent=level * 2)
-
-            if is_total or is_group:
-                label_cell.font = bold
-
-            for i, v in enumerate(vec, start=2):
-                write_amount(r, i, v, is_bold=is_total)
-
-            write_amount(r, total_col, row_total, is_bold=is_total)
-            r += 1
+            ws.append(
+                [label_cell(ws, row["label"], int(row["level"]), bold=is_total or is_group)]
+                + amounts(row["periods"], row["row_total"], is_bold=is_total)
+            )
 
         # Total section line
-        ws.cell(r, 1).value = f"Total {sec['section']}"
-        ws.cell(r, 1).font = bold
-        for i, v in enumerate(sec["section_totals"], start=2):
-            write_amount(r, i, v, is_bold=True)
-        write_amount(r, total_col, sec["section_total"], is_bold=True)
-        r += 2
+        ws.append(
+            [styled(ws, f"Total {sec['section']}", BOLD)]
+            + amounts(sec["section_totals"], sec["section_total"], is_bold=True)
+        )
+        ws.append([])
 
     # Summary lines
-    def write_summary(label: str, vec: list[float]):
-        nonlocal r
-        ws.cell(r, 1).value = label
-        ws.cell(r, 1).font = bold
-        for i, v in enumerate(vec, start=2):
-            write_amount(r, i, v, is_bold=True)
-        write_amount(r, total_col, sum(vec), is_bold=True)
-        r += 1
-
-    write_summary("Gross Profit", pnl["totals"]["gross_profit"])
-    write_summary("Net Earnings", pnl["totals"]["net_profit"])
+    for label, vec in (
+        ("Gross Profit", pnl["totals"]["gross_profit"]),
+        ("Net Earnings", pnl["totals"]["net_profit"]),
+    ):
+        ws.append([styled(ws, label, BOLD)] + amounts(vec, sum(vec), is_bold=True))
 
     # Footer
-    r += 2
-    ws.cell(r, 1).value = datetime.now().strftime("%A, %b. %d, %Y %I:%M:%S %p") + " - Accruals Basis"
-
-    # Column widths
-    ws.column_dimensions["A"].width = 50
-    for c in range(2, total_col + 1):
-        ws.column_dimensions[get_column_letter(c)].width = 18
+    ws.append([])
+    ws.append([])
+    ws.append([datetime.now().strftime("%A, %b. %d, %Y %I:%M:%S %p") + " - Accruals Basis"])
 
     return wb
-
-
-def workbook_to_bytes(wb: Workbook) -> bytes:
-    bio = BytesIO()
-    wb.save(bio)
-    return bio.getvalue()
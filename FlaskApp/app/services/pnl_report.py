@@ -1,16 +1,18 @@
 # FlaskApp/app/services/pnl_report.py
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from datetime import date
 from typing import Any, Dict, List, Tuple
 
 from sqlalchemy import case, func
 
-from FlaskApp.app.accounting_db import db
+from FlaskApp.app.accounting_db import report_session
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.account import Account
+from FlaskApp.app.services.account_hierarchy import AccountHierarchy, ReportTree, TreeAmounts, get_account_hierarchy
+from FlaskApp.app.services.report_periods import period_bounds
+from FlaskApp.app.utils.money import from_cents
 
 
 # ---- Account types from your CSV ----
@@ -38,10 +40,6 @@ TYPE_TO_SECTION = {
 SHOW_TYPE_SUBHEADINGS = True
 
 
-def _parse_path(name: str) -> List[str]:
-    return [p.strip() for p in name.split(":") if p.strip()]
-
-
 def _pnl_display_amount(account_type: str, net_activity: float) -> float:
     """
     net_activity = sum(debits) - sum(credits) for the period (debit +, credit -).
@@ -54,172 +52,150 @@ def _pnl_display_amount(account_type: str, net_activity: float) -> float:
     return float(net_activity or 0.0)
 
 
-@dataclass
-class Node:
-    name: str
-    children: Dict[str, "Node"] = field(default_factory=dict)
-
-    # per-period postings directly to this node
-    direct: List[float] = field(default_factory=list)
-
-    # per-period totals including descendants
-    total: List[float] = field(default_factory=list)
-
-    def ensure_len(self, n: int) -> None:
-        if len(self.direct) < n:
-            self.direct.extend([0.0] * (n - len(self.direct)))
-        if len(self.total) < n:
-            self.total.extend([0.0] * (n - len(self.total)))
+def _pnl_tree(hier: AccountHierarchy) -> ReportTree:
+    """P&L layout: section -> optional type subheading -> account name path."""
+    tree = ReportTree(tuple(SECTION_ORDER))
+    for acct in hier.accounts.values():
+        sec = TYPE_TO_SECTION.get(acct.type)
+        if not sec:
+            continue
 
+        acct_path = acct.path
 
-def _add_amount(root: Node, path: List[str], period_idx: int, amount: float, n_periods: int) -> None:
-    cur = root
-    for part in path:
-        cur = cur.children.setdefault(part, Node(part))
-    cur.ensure_len(n_periods)
-    cur.direct[period_idx] += float(amount or 0.0)
+        # optional subheading by Type within section
+        if SHOW_TYPE_SUBHEADINGS and sec in ("Income", "Expenses"):
+            acct_path = (acct.type,) + acct_path
+        elif SHOW_TYPE_SUBHEADINGS and sec == "Cost of Goods Sold":
+            acct_path = ("Cost of Goods Sold",) + acct_path
 
+        tree.account_nodes[acct.id] = tree.node(sec, acct_path)
+    return tree
 
-def _rollup(node: Node, n_periods: int) -> List[float]:
-    node.ensure_len(n_periods)
 
-    # start from direct postings
-    total = node.direct[:]
-
-    # add children totals
-    for child in node.children.values():
-        child_total = _rollup(child, n_periods)
-        total = [total[i] + child_total[i] for i in range(n_periods)]
-
-    node.total = total
-    return total
-
-
-def _flatten(node: Node, base_path: List[str], level: int, n_periods: int) -> List[Dict[str, Any]]:
+def _query_period_net_activity(entity_id: int, start_date: date, end_date: date) -> List[Tuple[int, float]]:
     """
-    Flattens preserving FULL PATH (no ambiguity if duplicate names exist elsewhere).
-    We produce:
-      - account line (node itself)
-      - children lines
-      - "Total X" line if node has children
+    Returns (account_id, net_activity)
+    net_activity uses debit-positive / credit-negative over the period.
     """
-    rows: List[Dict[str, Any]] = []
-
-    path = base_path + [node.name]
-    full_path = ":".join(path)
-
-    has_children = len(node.children) > 0
-
-    rows.append({
-        "label": node.name,
-        "path": path,
-        "full_path": full_path,
-        "level": level,
-        "kind": "group" if has_children else "account",
-        "periods": node.total[:n_periods],
-        "row_total": sum(node.total[:n_periods]),
-    })
-
-    for key in sorted(node.children.keys()):
-        rows.extend(_flatten(node.children[key], path, level + 1, n_periods))
-
-    if has_children:
-        rows.append({
-            "label": f"Total {node.name}",
-            "path": path,                 # total belongs to the same node path
-            "full_path": full_path,
-            "level": level,
-            "kind": "total",
-            "periods": node.total[:n_periods],
-            "row_total": sum(node.total[:n_periods]),
-        })
+    net_expr = func.sum(
+        case(
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
+        )
+    )
 
-    return rows
+    q = (
+        report_session().query(
+            Account.id.label("account_id"),
+            net_expr.label("net_activity"),
+        )
+        .join(TransactionLine, TransactionLine.account_id == Account.id)
+        .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .filter(Account.entity_id == entity_id)
+        .filter(Transaction.entity_id == entity_id)
+        .filter(Account.type.in_(PNL_TYPES))
+        .filter(Transaction.date >= start_date, Transaction.date <= end_date)
+        .group_by(Account.id)
+        .order_by(Account.id)
+    )
 
+    return [(int(r.account_id), from_cents(r.net_activity)) for r in q.all()]
 
-def _query_period_net_activity(entity_id: int, start_date: date, end_date: date) -> List[Tuple[str, str, float]]:
+
+def _query_periods_net_activity(
+    entity_id: int, periods: List[Tuple[str, date, date]]
+) -> List[Tuple[int, int, float]]:
     """
-    Returns (account_type, account_full_name, net_activity)
-    net_activity uses debit-positive / credit-negative over the period.
+    Returns (period_idx, account_id, net_activity) for ALL periods
+    in one grouped query.
+
+    The period boundaries are range-joined on Transaction.date, so overlapping periods
+    (e.g. monthly columns plus a YTD column) are each aggregated correctly.
     """
+    bounds = period_bounds([(start, end) for (_, start, end) in periods])
+
     net_expr = func.sum(
         case(
-            (TransactionLine.is_debit.is_(True), TransactionLine.amount),
-            else_=-TransactionLine.amount,
+            (TransactionLine.is_debit.is_(True), TransactionLine.amount_cents),
+            else_=-TransactionLine.amount_cents,
         )
     )
 
     q = (
-        db.session.query(
-            Account.type.label("account_type"),
-            Account.name.label("account_name"),
+        report_session().query(
+            bounds.c.period_idx.label("period_idx"),
+            Account.id.label("account_id"),
             net_expr.label("net_activity"),
         )
+        .select_from(Account)
         .join(TransactionLine, TransactionLine.account_id == Account.id)
         .join(Transaction, Transaction.id == TransactionLine.transaction_id)
+        .join(
+            bounds,
+            (Transaction.date >= bounds.c.start_date) & (Transaction.date <= bounds.c.end_date),
+        )
         .filter(Account.entity_id == entity_id)
         .filter(Transaction.entity_id == entity_id)
         .filter(Account.type.in_(PNL_TYPES))
-        .filter(Transaction.date >= start_date, Transaction.date <= end_date)
-        .group_by(Account.type, Account.name)
-        .order_by(Account.type, Account.name)
+        .group_by(bounds.c.period_idx, Account.id)
+        .order_by(bounds.c.period_idx, Account.id)
     )
 
-    return [(r.account_type, r.account_name, float(r.net_activity or 0.0)) for r in q.all()]
+    return [(int(r.period_idx), int(r.account_id), from_cents(r.net_activity)) for r in q.all()]
 
 
-def build_pnl(entity_id: int, periods: List[Tuple[str, date, date]]) -> Dict[str, Any]:
+def build_pnl(
+    entity_id: int,
+    periods: List[Tuple[str, date, date]],
+    single_pass: bool = True,
+) -> Dict[str, Any]:
     """
     periods: [(label, start_date, end_date), ...]
     Returns JSON-friendly structure ready for Dash or Excel export.
+
+    single_pass=True aggregates every period in one grouped query; False falls back
+    to one query per period.
     """
     if not periods:
         raise ValueError("periods must not be empty")
 
     n = len(periods)
 
-    # One tree per top-level section
-    trees: Dict[str, Node] = {sec: Node(sec) for sec in SECTION_ORDER}
-
-    # Fill trees with period amounts
-    for p_idx, (_, start, end) in enumerate(periods):
-        rows = _query_period_net_activity(entity_id, start, end)
-        for acct_type, acct_name, net_activity in rows:
-            sec = TYPE_TO_SECTION.get(acct_type)
-            if not sec:
-                continue
-
-            display_amt = _pnl_display_amount(acct_type, net_activity)
+    if single_pass:
+        activity = _query_periods_net_activity(entity_id, periods)
+    else:
+        activity = [
+            (p_idx, account_id, net_activity)
+            for p_idx, (_, start, end) in enumerate(periods)
+            for account_id, net_activity in _query_period_net_activity(entity_id, start, end)
+        ]
 
-            # hierarchy from colon
-            acct_path = _parse_path(acct_name)
+    # Accounts are parsed and placed once per entity (services.account_hierarchy)
+    hier = get_account_hierarchy(entity_id, {account_id for _, account_id, _ in activity})
+    tree = hier.layout("pnl", _pnl_tree)
+    amounts = TreeAmounts(tree, n)
 
-            # optional subheading by Type within section
-            if SHOW_TYPE_SUBHEADINGS and sec in ("Income", "Expenses"):
-                acct_path = [acct_type] + acct_path
-            elif SHOW_TYPE_SUBHEADINGS and sec == "Cost of Goods Sold":
-                acct_path = ["Cost of Goods Sold"] + acct_path
-
-            _add_amount(trees[sec], acct_path, p_idx, display_amt, n)
+    # Fill trees with period amounts
+    placed = [
+        (tree.account_nodes[account_id], p_idx, _pnl_display_amount(hier.accounts[account_id].type, net_activity))
+        for p_idx, account_id, net_activity in activity
+        if account_id in tree.account_nodes
+    ]
+    if placed:
+        amounts.add_many(*zip(*placed))
 
     # Roll up totals
-    for sec in SECTION_ORDER:
-        _rollup(trees[sec], n)
+    amounts.rollup()
 
     # Flatten sections
     out_sections: List[Dict[str, Any]] = []
     section_totals: Dict[str, List[float]] = {}
 
     for sec in SECTION_ORDER:
-        root = trees[sec]
-
         # Flatten children of the root, not the root itself
-        sec_rows: List[Dict[str, Any]] = []
-        for key in sorted(root.children.keys()):
-            child = root.children[key]
-            sec_rows.extend(_flatten(child, base_path=[], level=0, n_periods=n))
+        sec_rows = amounts.flatten(sec, "periods")
 
-        sec_total = root.total[:n]
+        sec_total = amounts.section_total(sec)
         section_totals[sec] = sec_total
 
         out_sections.append({
@@ -0,0 +1,75 @@
+# FlaskApp/app/services/report_cache.py
+# Per-process LRU cache of built reports, tagged with the entity's ledger_version.
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from flask import current_app
+
+from FlaskApp.app.accounting_db import db, report_session
+from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.services.balance_sheet_report import build_balance_sheet
+from FlaskApp.app.services.pnl_report import build_pnl
+
+DEFAULT_REPORT_CACHE_SIZE = 64
+
+_lock = threading.Lock()
+_entries: "OrderedDict[Tuple[int, str, Hashable], Tuple[int, Any]]" = OrderedDict()
+
+
+def get_ledger_version(entity_id: int) -> int:
+    return int(
+        report_session().query(Entity.ledger_version).filter(Entity.id == entity_id).scalar() or 0
+    )
+
+
+def bump_ledger_version(entity_id: int) -> None:
+    """Invalidate cached reports for an entity. Call before committing a ledger write."""
+    db.session.query(Entity).filter(Entity.id == entity_id).update(
+        {Entity.ledger_version: Entity.ledger_version + 1},
+        synchronize_session=False,
+    )
+
+
+def cached_report(entity_id: int, report_type: str, spec: Hashable, build: Callable[[], Any]) -> Any:
+    """
+    Return the cached report for (entity_id, report_type, spec), building it on a miss.
+
+    Served only while the entity's ledger_version is unchanged. Cached reports are
+    shared between callers: do not mutate them.
+    """
+    version = get_ledger_version(entity_id)
+    key = (int(entity_id), report_type, spec)
+
+    with _lock:
+        hit = _entries.get(key)
+        if hit is not None and hit[0] == version:
+            _entries.move_to_end(key)
+            return hit[1]
+
+    report = build()
+
+    max_size = int(current_app.config.get("REPORT_CACHE_SIZE", DEFAULT_REPORT_CACHE_SIZE))
+    with _lock:
+        _entries[key] = (version, report)
+        _entries.move_to_end(key)
+        while len(_entries) > max_size:
+            _entries.popitem(last=False)
+
+    return report
+
+
+def clear_report_cache() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def cached_pnl(entity_id: int, periods: List[Tuple[str, date, date]]) -> Dict[str, Any]:
+    return cached_report(entity_id, "pnl", tuple(periods), lambda: build_pnl(entity_id, periods))
+
+
+def cached_balance_sheet(entity_id: int, cols: List[Tuple[str, date]]) -> Dict[str, Any]:
+    return cached_report(entity_id, "balance_sheet", tuple(cols), lambda: build_balance_sheet(entity_id, cols))
@@ -0,0 +1,145 @@
+# FlaskApp/app/services/report_client.py
+# Report access for Dash callbacks: in-process by default, over HTTP when REPORTS_API_BASE_URL is set.
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlencode
+
+import requests
+from flask import current_app
+
+import FlaskApp.app.common as common
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.services.account_ledger import build_account_ledger
+from FlaskApp.app.services.entities import EntityInfo, get_entity_by_id, get_entity_by_name, session_entity_id
+from FlaskApp.app.services.balance_sheet_excel import balance_sheet_subtitle, build_balance_sheet_workbook
+from FlaskApp.app.services.excel_stream import workbook_to_bytes
+from FlaskApp.app.services.pnl_excel import build_pnl_workbook, pnl_subtitle
+from FlaskApp.app.services.report_cache import cached_balance_sheet, cached_pnl
+from FlaskApp.app.services.report_periods import balance_sheet_cols_from_args, pnl_periods_from_args
+
+
+class ReportClientError(Exception):
+    """The report could not be produced; str(e) is safe to show to the user."""
+
+
+def _remote_base_url() -> Optional[str]:
+    return current_app.config.get("REPORTS_API_BASE_URL") or None
+
+
+def _http_get(path: str, params: Mapping[str, Any]) -> requests.Response:
+    url = _remote_base_url().rstrip("/") + path
+    if params:
+        url += "?" + urlencode(params)
+
+    try:
+        resp = requests.get(
+            url,
+            headers={"X-Internal-Token": common.access_secret_version("global_parameters", None, "api_token")},
+            verify=common.api_verify,
+            timeout=30,
+        )
+    except Exception as e:
+        raise ReportClientError(str(e)) from e
+
+    if resp.status_code != 200:
+        msg = f"HTTP {resp.status_code}"
+        try:
+            msg = resp.json().get("error", msg)
+        except Exception:
+            pass
+        raise ReportClientError(msg)
+
+    return resp
+
+
+def _resolve_entity(params: Mapping[str, Any]) -> EntityInfo:
+    """Same precedence as reports_api: entity_id, then entity name, then the session."""
+    entity = None
+    if params.get("entity_id"):
+        entity = get_entity_by_id(int(params["entity_id"]))
+    elif params.get("entity"):
+        entity = get_entity_by_name(params["entity"])
+    else:
+        entity_id = session_entity_id()
+        if entity_id is not None:
+            entity = get_entity_by_id(entity_id)
+
+    if not entity:
+        raise ReportClientError("No current entity (pass ?entity=... or select one)")
+    return entity
+
+
+def _pnl_inputs(params: Mapping[str, Any]):
+    entity = _resolve_entity(params)
+    periods = pnl_periods_from_args(params)
+    if not periods:
+        raise ReportClientError("Provide at least p1_start and p1_end")
+    return entity, periods
+
+
+def _balance_sheet_inputs(params: Mapping[str, Any]):
+    entity = _resolve_entity(params)
+    cols = balance_sheet_cols_from_args(params)
+    if not cols:
+        raise ReportClientError("Provide at least c1_date")
+    return entity, cols
+
+
+def get_pnl(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """P&L for the /api/reports/pnl query params (p1_start/p1_end/..., entity=<name>)."""
+    if _remote_base_url():
+        return _http_get("/api/reports/pnl", params).json()
+
+    entity, periods = _pnl_inputs(params)
+    return cached_pnl(entity.id, periods)
+
+
+def get_pnl_xlsx(params: Mapping[str, Any]) -> bytes:
+    if _remote_base_url():
+        return _http_get("/api/reports/pnl.xlsx", params).content
+
+    entity, periods = _pnl_inputs(params)
+    pnl = cached_pnl(entity.id, periods)
+    return workbook_to_bytes(build_pnl_workbook(pnl, entity.name, pnl_subtitle(periods)))
+
+
+def get_balance_sheet(params: Mapping[str, Any]) -> Dict[str, Any]:
+    """Balance Sheet for the /api/reports/balance_sheet query params (c1_date/..., entity=<name>)."""
+    if _remote_base_url():
+        return _http_get("/api/reports/balance_sheet", params).json()
+
+    entity, cols = _balance_sheet_inputs(params)
+    return cached_balance_sheet(entity.id, cols)
+
+
+def get_balance_sheet_xlsx(params: Mapping[str, Any]) -> bytes:
+    if _remote_base_url():
+        return _http_get("/api/reports/balance_sheet.xlsx", params).content
+
+    entity, cols = _balance_sheet_inputs(params)
+    bs = cached_balance_sheet(entity.id, cols)
+    return workbook_to_bytes(build_balance_sheet_workbook(bs, entity.name, balance_sheet_subtitle(cols)))
+
+
+def get_account_ledger(account_id: int, params: Optional[Mapping[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Ledger rows for an account (newest first); params as for /api/accounts/<id>/ledger."""
+    params = params or {}
+    if _remote_base_url():
+        return _http_get(f"/api/accounts/{account_id}/ledger", params).json()
+
+    account = db.session.get(Account, account_id)
+    if not account:
+        raise ReportClientError(f"Account {account_id} not found")
+
+    return build_account_ledger(
+        account,
+        # Like the former loopback call (which carried no session cookie), the Dash
+        # ledger is not narrowed by entity unless one is passed explicitly.
+        entity_name=params.get("entity") or None,
+        start_date=params.get("start_date") or None,
+        end_date=params.get("end_date") or None,
+        limit=int(params["limit"]) if params.get("limit") else None,
+        page=max(int(params.get("page") or 1), 1),
+    )
@@ -0,0 +1,63 @@
+# FlaskApp/app/services/report_periods.py
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Mapping, Tuple
+
+from sqlalchemy import Date, Integer, literal, select, union_all
+
+
+def period_bounds(ranges: List[Tuple[date, date]], name: str = "period_bounds"):
+    """
+    Inline table of (period_idx, start_date, end_date), one row per range.
+
+    Range-join it on Transaction.date and group by period_idx to aggregate many
+    (possibly overlapping) date ranges in a single query. Built as a UNION ALL of
+    literal SELECTs because SQLite does not accept column aliases on VALUES.
+    """
+    return union_all(
+        *[
+            select(
+                literal(idx, Integer).label("period_idx"),
+                literal(start, Date).label("start_date"),
+                literal(end, Date).label("end_date"),
+            )
+            for idx, (start, end) in enumerate(ranges)
+        ]
+    ).subquery(name)
+
+
+def pnl_periods_from_args(args: Mapping[str, str]) -> List[Tuple[str, date, date]]:
+    """
+    P&L columns from query-style params:
+      p1_start=2023-07-01&p1_end=2024-06-30&p1_label=...&p2_start=...
+    Stops at the first missing pN_start/pN_end.
+    """
+    periods = []
+    i = 1
+    while True:
+        s = args.get(f"p{i}_start")
+        e = args.get(f"p{i}_end")
+        lbl = args.get(f"p{i}_label") or f"Period {i}"
+        if not s or not e:
+            break
+        periods.append((lbl, date.fromisoformat(s), date.fromisoformat(e)))
+        i += 1
+    return periods
+
+
+def balance_sheet_cols_from_args(args: Mapping[str, str]) -> List[Tuple[str, date]]:
+    """
+    Balance sheet columns from query-style params: c1_date=...&c1_label=...&c2_date=...
+    Stops at the first missing cN_date.
+    """
+    cols = []
+    i = 1
+    while True:
+        d = args.get(f"c{i}_date")
+        lbl = args.get(f"c{i}_label") or f"As of {i}"
+        if not d:
+            break
+        cols.append((lbl, date.fromisoformat(d)))
+        i += 1
+    return cols
@@ -1,41 +1,133 @@
-from sqlalchemy import func, case
+import base64
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, case, tuple_
 from FlaskApp.app.accounting_db import db
 from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
 from FlaskApp.app.models.account import Account
 from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.services.transaction_search import transaction_text_filter
+from FlaskApp.app.utils.money import from_cents, parse_cents
+from FlaskApp.app.utils.sql import distinct_string_agg
 
-def get_transaction_list(
+class TransactionListRow(NamedTuple):
+    id: int
+    transaction_id: int
+    date: date
+    description: Optional[str]
+    transaction_type: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    posted_at: Optional[datetime]
+    debit_total: float
+    credit_total: float
+    account_names: Optional[str]
+    debit_account_id: Optional[int]
+    credit_account_id: Optional[int]
+
+
+def encode_cursor(row):
+    """
+    Opaque keyset cursor for the row a page ended on: (date, created_at, id).
+    """
+    raw = f"{row.date.isoformat()}|{row.created_at.isoformat()}|{int(row.id)}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Inverse of encode_cursor. Raises ValueError for a malformed cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        d, created_at, txn_pk = raw.split("|")
+        return date.fromisoformat(d), datetime.fromisoformat(created_at), int(txn_pk)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _apply_filters(
+    query,
     entity_id=None,
     entity_name=None,
-    status=None,          # "draft", "posted", or None
+    status=None,
     start_date=None,
     end_date=None,
-    account_id=None,      # NEW
-    search_amount=None,  # NEW: match debit/credit line amount
-    search_text=None,    # NEW: partial match on transaction description
+    account_id=None,
+    search_amount=None,
+    search_text=None,
 ):
     """
-    Returns one row per transaction with debit/credit totals.
+    Filters shared by the list and count queries. The query must already join
+    TransactionLine when account_id or search_amount is given.
+    """
+    if entity_id:
+        query = query.filter(Transaction.entity_id == entity_id)
+
+    if entity_name:
+        query = query.join(Transaction.entity).filter(Entity.name == entity_name)
+
+    if status == "draft":
+        query = query.filter(Transaction.posted_at.is_(None))
+    elif status == "posted":
+        query = query.filter(Transaction.posted_at.isnot(None))
+
+    if account_id:
+        query = query.filter(TransactionLine.account_id == account_id)
+
+
+    if search_text:
+        # Word-prefix match on description and line memos (FTS5; ILIKE fallback)
+        query = query.filter(transaction_text_filter(search_text))
+
+    amount_cents = parse_cents(search_amount)
+    if amount_cents is not None:
+        # Match any debit/credit line amount exactly (ix_transaction_lines_amount_cents)
+        query = query.filter(TransactionLine.amount_cents == abs(amount_cents))
+
+    if start_date:
+        query = query.filter(Transaction.date >= start_date)
+
+    if end_date:
+        query = query.filter(Transaction.date <= end_date)
+
+    return query
+
+
+def transaction_list_query(
+    entity_id=None,
+    entity_name=None,
+    status=None,
+    start_date=None,
+    end_date=None,
+    account_id=None,
+    search_amount=None,
+    search_text=None,
+    limit=None,
+    cursor=None,
+):
+    """
+    The get_transaction_list query, not yet executed (totals still in cents).
     """
 
+    # Summed as integer cents, converted to dollars once per row below
     debit_sum = func.sum(
         case(
-            (TransactionLine.is_debit == True, TransactionLine.amount),
+            (TransactionLine.is_debit == True, TransactionLine.amount_cents),
             else_=0,
         )
-    ).label("debit_total")
+    ).label("debit_cents")
 
     credit_sum = func.sum(
         case(
-            (TransactionLine.is_debit == False, TransactionLine.amount),
+            (TransactionLine.is_debit == False, TransactionLine.amount_cents),
             else_=0,
         )
-    ).label("credit_total")
+    ).label("credit_cents")
 
-    account_names = func.group_concat(
-        func.distinct(Account.name)
-    ).label("account_names")
+    account_names = distinct_string_agg(Account.name).label("account_names")
 
     debit_account_id = func.min(
         case(
@@ -60,6 +152,7 @@ def get_transaction_list(
             Transaction.description,
             Transaction.transaction_type,
             Transaction.created_at,
+            Transaction.updated_at,
             Transaction.posted_at,
             debit_sum,
             credit_sum,
@@ -71,41 +164,127 @@ def get_transaction_list(
         .outerjoin(TransactionLine, TransactionLine.transaction_id == Transaction.id)
         .outerjoin(Account, TransactionLine.account_id == Account.id)
         .group_by(Transaction.id)
-        .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+        .order_by(Transaction.date.desc(), Transaction.created_at.desc(), Transaction.id.desc())
     )
 
-    if entity_name:
-        query = query.join(Transaction.entity).filter(Entity.name == entity_name)
+    query = _apply_filters(
+        query,
+        entity_id=entity_id,
+        entity_name=entity_name,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        search_amount=search_amount,
+        search_text=search_text,
+    )
 
-    if status == "draft":
-        query = query.filter(Transaction.posted_at.is_(None))
-    elif status == "posted":
-        query = query.filter(Transaction.posted_at.isnot(None))
+    if cursor:
+        query = query.filter(
+            tuple_(Transaction.date, Transaction.created_at, Transaction.id) < decode_cursor(cursor)
+        )
 
-    if account_id:
-        query = query.filter(TransactionLine.account_id == account_id)
+    if limit:
+        query = query.limit(limit)
 
+    return query
 
-    if search_text:
-        # Case-insensitive partial match on transaction description
-        query = query.filter(Transaction.description.ilike(f"%{search_text}%"))
-
-    if search_amount is not None and search_amount != "":
-        # Match any debit/credit line amount (with small tolerance for float comparisons)
-        try:
-            amt = float(search_amount)
-            tol = 0.005
-            query = query.filter(TransactionLine.amount.between(amt - tol, amt + tol))
-        except (TypeError, ValueError):
-            pass
 
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
+def get_transaction_list(
+    entity_id=None,
+    entity_name=None,
+    status=None,          # "draft", "posted", or None
+    start_date=None,
+    end_date=None,
+    account_id=None,      # NEW
+    search_amount=None,  # NEW: match debit/credit line amount
+    search_text=None,    # NEW: free-text match on description and line memos
+    limit=None,          # page size (None = everything)
+    cursor=None,         # encode_cursor() of the last row of the previous page
+):
+    """
+    Returns one row per transaction with debit/credit totals.
 
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
+    Ordered newest first by (date, created_at, id). With `cursor`, only rows strictly
+    after that position are returned (keyset pagination, no OFFSET scan).
+    """
+    query = transaction_list_query(
+        entity_id=entity_id,
+        entity_name=entity_name,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        search_amount=search_amount,
+        search_text=search_text,
+        limit=limit,
+        cursor=cursor,
+    )
+
+    return [
+        TransactionListRow(
+            id=r.id,
+            transaction_id=r.transaction_id,
+            date=r.date,
+            description=r.description,
+            transaction_type=r.transaction_type,
+            created_at=r.created_at,
+            updated_at=r.updated_at,
+            posted_at=r.posted_at,
+            debit_total=from_cents(r.debit_cents),
+            credit_total=from_cents(r.credit_cents),
+            account_names=r.account_names,
+            debit_account_id=r.debit_account_id,
+            credit_account_id=r.credit_account_id,
+        )
+        for r in query.all()
+    ]
+
+
+def get_transaction_page(limit, cursor=None, **filters):
+    """
+    One page of get_transaction_list plus the cursor for the next page
+    (None on the last page).
+    """
+    rows = get_transaction_list(limit=limit + 1, cursor=cursor, **filters)
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def count_transactions(
+    entity_id=None,
+    entity_name=None,
+    status=None,
+    start_date=None,
+    end_date=None,
+    account_id=None,
+    search_amount=None,
+    search_text=None,
+):
+    """
+    Total number of transactions matching the get_transaction_list filters.
+
+    Kept separate from the page query so the page itself never has to aggregate
+    the whole result; lines are only joined when a line-level filter needs them.
+    """
+    query = db.session.query(func.count(func.distinct(Transaction.id))).select_from(Transaction)
+
+    if account_id or parse_cents(search_amount) is not None:
+        query = query.join(TransactionLine, TransactionLine.transaction_id == Transaction.id)
+
+    query = _apply_filters(
+        query,
+        entity_id=entity_id,
+        entity_name=entity_name,
+        status=status,
+        start_date=start_date,
+        end_date=end_date,
+        account_id=account_id,
+        search_amount=search_amount,
+        search_text=search_text,
+    )
 
-    return query.all()
+    return int(query.scalar() or 0)
 
 def get_transaction_lines(transaction_id):
     """
@@ -120,11 +299,11 @@ def get_transaction_lines(transaction_id):
             TransactionLine.account_id,
             Account.name.label("account_name"),
             case(
-                (TransactionLine.is_debit == True, TransactionLine.amount),
+                (TransactionLine.is_debit == True, TransactionLine.amount_cents),
                 else_=0,
             ).label("debit"),
             case(
-                (TransactionLine.is_debit == False, TransactionLine.amount),
+                (TransactionLine.is_debit == False, TransactionLine.amount_cents),
                 else_=0,
             ).label("credit"),
             TransactionLine.memo,
@@ -141,8 +320,8 @@ def get_transaction_lines(transaction_id):
             "transaction_id": r.transaction_id,
             "account_id": r.account_id,
             "account_name": r.account_name,
-            "debit": float(r.debit or 0),
-            "credit": float(r.credit or 0),
+            "debit": from_cents(r.debit),
+            "credit": from_cents(r.credit),
             "memo": r.memo,
         }
         for r in rows
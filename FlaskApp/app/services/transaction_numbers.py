@@ -0,0 +1,75 @@
+# FlaskApp/app/services/transaction_numbers.py
+# Per-entity transaction numbers (transactions.transaction_id), allocated from transaction_number_sequences.
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_number_sequence import TransactionNumberSequence
+
+_sequences = TransactionNumberSequence.__table__
+
+
+def _advance(entity_id: int, count: int):
+    """Move the entity's counter on by `count`; its new last value, or None if it has no row."""
+    return db.session.execute(
+        update(_sequences)
+        .where(_sequences.c.entity_id == entity_id)
+        .values(last_value=_sequences.c.last_value + count)
+        .returning(_sequences.c.last_value)
+    ).scalar()
+
+
+def _create_sequence(entity_id: int) -> None:
+    start = (
+        db.session.query(func.max(Transaction.transaction_id))
+        .filter(Transaction.entity_id == entity_id)
+        .scalar()
+    )
+    try:
+        with db.session.begin_nested():
+            db.session.execute(
+                insert(_sequences).values(entity_id=entity_id, last_value=int(start or 0))
+            )
+    except IntegrityError:
+        pass  # created by a concurrent allocation; use theirs
+
+
+def allocate_transaction_numbers(entity_id: int, count: int = 1) -> int:
+    """
+    Reserve `count` consecutive transaction numbers for the entity; returns the first.
+
+    The sequence row stays locked until the caller commits, so a concurrent
+    allocation waits and continues after this block; a rollback releases the
+    numbers. Nothing is committed here.
+    """
+    if count < 1:
+        raise ValueError(f"count must be at least 1, got {count!r}")
+
+    entity_id = int(entity_id)
+    last = _advance(entity_id, count)
+    if last is None:
+        _create_sequence(entity_id)
+        last = _advance(entity_id, count)
+    return int(last) - count + 1
+
+
+def reserve_transaction_numbers(entity_id: int, numbers: Iterable[int]) -> None:
+    """Make sure later allocations come after `numbers` (transactions numbered by the caller)."""
+    highest = max((int(n) for n in numbers), default=None)
+    if highest is None:
+        return
+
+    entity_id = int(entity_id)
+    if _advance(entity_id, 0) is None:  # locks the row, if there is one
+        _create_sequence(entity_id)
+    db.session.execute(
+        update(_sequences)
+        .where(_sequences.c.entity_id == entity_id)
+        .where(_sequences.c.last_value < highest)
+        .values(last_value=highest)
+    )
@@ -0,0 +1,55 @@
+# FlaskApp/app/services/transaction_search.py
+# Free-text search over transaction descriptions and memos: SQLite FTS5 word-prefix match, ILIKE elsewhere.
+import re
+
+from sqlalchemy import column, inspect, select, table, text
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.models.transaction_search import TABLE_NAME
+
+USE_FTS_SEARCH = True
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_transaction_search = table(TABLE_NAME, column("rowid"))
+
+# Engines known to have the FTS table (only positive results are cached, so a
+# database migrated while the app runs is picked up)
+_fts_engines = set()
+
+
+def fts_query(search_text):
+    """FTS5 MATCH expression: every word as a quoted prefix term (implicit AND)."""
+    words = _WORD_RE.findall(search_text or "")
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _fts_enabled():
+    engine = db.engine
+    if not USE_FTS_SEARCH or engine.dialect.name != "sqlite":
+        return False
+    if engine not in _fts_engines:
+        if not inspect(engine).has_table(TABLE_NAME):
+            return False  # e.g. an old db.create_all() database: ILIKE fallback
+        _fts_engines.add(engine)
+    return True
+
+
+def transaction_text_filter(search_text):
+    """
+    Filter clause on Transaction for free-text `search_text`: every word must match
+    the start of a word in the description or a line memo ("wool metro" finds
+    "Woolworths Metro 123"). Without FTS, ILIKE '%text%' on the description.
+    """
+    match = fts_query(search_text) if _fts_enabled() else None
+    if not match:
+        return Transaction.description.ilike(f"%{search_text}%")
+
+    matching_ids = (
+        select(_transaction_search.c.rowid)
+        .where(text("transaction_search MATCH :fts_match").bindparams(fts_match=match))
+    )
+    return Transaction.id.in_(matching_ids)
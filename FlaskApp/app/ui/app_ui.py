@@ -2,18 +2,27 @@ from flask import Blueprint, request, redirect, session, url_for, flash
 from flask_login import login_required
 from sqlalchemy.exc import IntegrityError
 
-from FlaskApp.app.services.entities import create_entity
+from FlaskApp.app.services.entities import (
+    SESSION_ENTITY_ID_KEY,
+    SESSION_ENTITY_KEY,
+    create_entity,
+    get_entity_by_name,
+    set_session_entity,
+)
 
 bp = Blueprint("app_ui", __name__)
 
-SESSION_ENTITY_KEY = "current_entity"
-
 @bp.route("/set-entity", methods=["POST"])
 @login_required
 def set_entity():
     entity = request.form.get("entity")
     if entity:
-        session[SESSION_ENTITY_KEY] = entity
+        ent = get_entity_by_name(entity)
+        if ent:
+            set_session_entity(ent)
+        else:
+            session[SESSION_ENTITY_KEY] = entity
+            session.pop(SESSION_ENTITY_ID_KEY, None)
     return redirect(request.referrer or url_for("homepage"))
 
 @bp.route("/entities/new", methods=["POST"])
@@ -26,7 +35,7 @@ def add_entity():
 
     try:
         ent = create_entity(name=name, type_=type_, description=description)
-        session[SESSION_ENTITY_KEY] = ent.name
+        set_session_entity(ent)
         flash(f"Entity created: {ent.name}", "success")
     except ValueError as e:
         flash(str(e), "error")
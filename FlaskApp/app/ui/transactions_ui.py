@@ -1,29 +1,35 @@
 from __future__ import annotations
 
+import re
 from datetime import date, datetime
 from typing import Dict, List, Optional, Tuple
 
 from flask import Blueprint, abort, flash, redirect, render_template, request, session, url_for, current_app
 from flask_login import login_required
-from sqlalchemy import func, select
-from sqlalchemy.orm import load_only
 
 from FlaskApp.app.accounting_db import db
 from FlaskApp.app.models.account import Account
 from FlaskApp.app.models.csv_account_mapping import CsvAccountMapping
 from FlaskApp.app.models.csv_import_review import CsvImportReview
-from FlaskApp.app.models.entity import Entity
-from FlaskApp.app.models.transaction import Transaction
 from FlaskApp.app.models.transaction_line import TransactionLine
+from FlaskApp.app.services.account_balances import refresh_account_balances
+from FlaskApp.app.services.report_cache import bump_ledger_version
 from FlaskApp.app.services.accounts import get_accounts
 from FlaskApp.app.services.balance_sheet_report import ASSET_TYPES
-from FlaskApp.app.services.banktivity_import import parse_banktivity_csv
-from FlaskApp.app.services.entities import get_entities
+from FlaskApp.app.services.bulk_import import ImportLine, ImportTransaction, bulk_insert_transactions
+from FlaskApp.app.services.duplicate_matching import load_date_amount_index
+from FlaskApp.app.services.entities import get_entities, session_entity_id
+from FlaskApp.app.services.import_sessions import create_import_session, load_import_session
+from FlaskApp.app.services.payee_suggestions import suggest_accounts, update_payee_index
 from FlaskApp.app.services.transaction_detail import get_transaction_detail
-from FlaskApp.app.services.transaction_list import get_transaction_list
+from FlaskApp.app.services.transaction_list import count_transactions, get_transaction_page
 
 bp = Blueprint("transactions_ui", __name__, url_prefix="/transactions")
 
+LIST_PAGE_SIZE = 100
+
+_AMOUNT_RE = re.compile(r"^\s*\$?\s*-?[\d,]*\d(\.\d{1,2})?\s*$")
+
 
 # ------------------------------
 # Helpers
@@ -31,10 +37,15 @@ bp = Blueprint("transactions_ui", __name__, url_prefix="/transactions")
 def _current_entity_id() -> int:
     name = session.get("current_entity") or "JAJG Pty Ltd"
     session["current_entity"] = name
-    ent = db.session.query(Entity).filter(Entity.name == name).one_or_none()
-    if not ent:
+    entity_id = session_entity_id()
+    if entity_id is None:
         abort(400, description=f"Unknown entity '{name}'")
-    return int(ent.id)
+    return entity_id
+
+
+def _looks_like_amount(text: str) -> bool:
+    """A number written as money ("1,234.56", "$80", "12.50"); bare integers stay text."""
+    return bool(_AMOUNT_RE.match(text)) and any(c in text for c in "$.,")
 
 
 def _csv_txn_fingerprint(dt: date, signed_amount: float, asset_account_id: int, term: str) -> str:
@@ -126,9 +137,15 @@ def index():
     start_date = request.args.get("start_date") or None
     end_date = request.args.get("end_date") or None
     q = request.args.get("q") or None
-    amount = request.args.get("amount", type=float)
+    amount = request.args.get("amount") or None
 
-    transactions = get_transaction_list(
+    # The header search box ("Desc or amount…") only sends q: search something
+    # like "1,234.56" or "$80" as an exact line amount rather than as text.
+    if q and amount is None and _looks_like_amount(q):
+        q, amount = None, q
+    cursor = request.args.get("cursor") or None
+
+    filters = dict(
         entity_name=entity_name,
         status=status,
         start_date=start_date,
@@ -138,9 +155,21 @@ def index():
         search_amount=amount,
     )
 
+    try:
+        transactions, next_cursor = get_transaction_page(LIST_PAGE_SIZE, cursor=cursor, **filters)
+    except ValueError:
+        abort(400, description="Invalid page cursor")
+
+    # Filters without the cursor, for the pager links
+    page_args = {k: v for k, v in request.args.items() if k != "cursor" and v not in (None, "")}
+
     return render_template(
         "transactions/list.html",
         transactions=transactions,
+        total_count=count_transactions(**filters),
+        next_cursor=next_cursor,
+        cursor=cursor,
+        page_args=page_args,
         start_date=start_date,
         end_date=end_date,
         account_id=account_id,
@@ -178,20 +207,18 @@ def import_csv():
     if start_date_str:
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
 
-    csv_path = request.values.get("csv_path") or ""
+    import_id = request.values.get("import_id") or ""
     last_imported_ids = session.pop("csv_last_imported_ids", None)
 
-    # Upload handling
+    # Upload handling: parse once into a server-side import session
     if request.method == "POST" and "csv_file" in request.files and request.files["csv_file"].filename:
         f = request.files["csv_file"]
-        ts = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        safe_name = f.filename.replace("/", "_").replace("\\", "_")
-        import os
+        import_id = create_import_session(entity_id, f.stream, f.filename).import_id
 
-        tmp_dir = os.path.join(bp.root_path, "..", "tmp")
-        os.makedirs(tmp_dir, exist_ok=True)
-        csv_path = os.path.join(tmp_dir, f"banktivity_{entity_id}_{ts}_{safe_name}")
-        f.save(csv_path)
+    imp = load_import_session(import_id, entity_id) if import_id else None
+    if import_id and imp is None:
+        flash("This import has expired or was not found. Please upload the CSV again.", "error")
+        import_id = ""
 
     # Load persisted mappings (CSV asset account name -> account_id)
     mappings: Dict[str, int] = {
@@ -204,8 +231,8 @@ def import_csv():
         )
     }
 
-    # Parse csv (if provided)
-    txns = parse_banktivity_csv(csv_path, start_date=start_date) if csv_path else []
+    # Parsed transactions of the import session (if any)
+    txns = imp.transactions_from(start_date) if imp else []
 
     # Mapping rows (show existing + any new accounts from this CSV)
     csv_account_names = sorted({ln.csv_account_name for t in txns for ln in getattr(t, "lines", [])}) if txns else []
@@ -265,7 +292,7 @@ def import_csv():
 
         db.session.commit()
         flash(f"Saved {updates} mapping change(s).", "success")
-        return redirect(url_for("transactions_ui.import_csv", csv_path=csv_path, start_date=start_date_str, show_mappings="1"))
+        return redirect(url_for("transactions_ui.import_csv", import_id=import_id, start_date=start_date_str, show_mappings="1"))
 
     # ------------------------------
     # Import selected / mark duplicates
@@ -276,20 +303,20 @@ def import_csv():
         confirmed = {int(x) for x in request.form.getlist("confirm_trn_no") if x}
 
         current_app.logger.warning(
-            "CSV import POST: csv_path=%s start_date=%s selected_ids=%s dup_ids=%s total_csv_txns=%s",
-            csv_path,
+            "CSV import POST: import_id=%s start_date=%s selected_ids=%s dup_ids=%s total_csv_txns=%s",
+            import_id,
             start_date_str,
             sorted(selected_ids),
             sorted(dup_ids),
             len(txns),
         )
 
-        if not csv_path:
+        if not import_id:
             flash("No CSV uploaded.", "error")
             return redirect(url_for("transactions_ui.import_csv"))
 
-        # Always re-parse and re-load mappings (don't trust posted values)
-        txns = parse_banktivity_csv(csv_path, start_date=start_date)
+        # Rows come from the server-side import session and mappings are re-loaded
+        # (don't trust posted values)
         txn_by_id = {int(t.trn_no): t for t in txns}
 
         mappings = {
@@ -337,7 +364,7 @@ def import_csv():
                 flash(f"Saved {saved_dups} duplicate review(s).", "success")
             else:
                 flash("No transactions selected.", "warning")
-            return redirect(url_for("transactions_ui.import_csv", csv_path=csv_path, start_date=start_date_str, show_mappings="1"))
+            return redirect(url_for("transactions_ui.import_csv", import_id=import_id, start_date=start_date_str, show_mappings="1"))
 
         # Validate mappings exist for every line of every selected txn
         unmapped_needed: set[str] = set()
@@ -354,20 +381,19 @@ def import_csv():
                 "Cannot import yet. Please map these CSV accounts first: " + ", ".join(sorted(unmapped_needed)),
                 "error",
             )
-            return redirect(url_for("transactions_ui.import_csv", csv_path=csv_path, start_date=start_date_str, show_mappings="1"))
-
-        # Compute next transaction_id sequence number
-        next_txn_id = (
-            db.session.query(func.max(Transaction.transaction_id))
-            .filter(Transaction.entity_id == entity_id)
-            .scalar()
-            or 0
-        )
+            return redirect(url_for("transactions_ui.import_csv", import_id=import_id, start_date=start_date_str, show_mappings="1"))
 
-        tol = 0.005
-        imported = 0
-        imported_txn_ids: List[int] = []
+        pending: List[ImportTransaction] = []
+        pending_fingerprints: List[Optional[str]] = []
         blocked_for_review: List[int] = []
+        touched_account_ids: set[int] = set()
+        earliest_date: Optional[date] = None
+
+        # Existing date+amount pairs for every selected row, loaded in one query.
+        # Rows queued below are added to it so later rows in the batch match them too.
+        match_index = load_date_amount_index(
+            entity_id, (txn_by_id[n].date for n in selected_ids if n in txn_by_id)
+        )
 
         for trn_no in sorted(selected_ids):
             t = txn_by_id.get(trn_no)
@@ -376,42 +402,28 @@ def import_csv():
 
             # Require confirm if candidates exist
             amt = float(t.total_abs or 0)
-            candidates_exist = False
-            if amt > 0:
-                candidates_exist = (
-                    db.session.query(Transaction.id)
-                    .join(TransactionLine)
-                    .filter(Transaction.entity_id == entity_id)
-                    .filter(Transaction.date == t.date)
-                    .filter(TransactionLine.amount.between(amt - tol, amt + tol))
-                    .distinct()
-                    .first()
-                    is not None
-                )
+            candidates_exist = bool(match_index.match_ids(t.date, amt))
 
             if candidates_exist and trn_no not in confirmed:
                 blocked_for_review.append(trn_no)
                 continue
 
-            next_txn_id += 1
-            txn = Transaction(
-                entity_id=entity_id,
-                transaction_id=int(next_txn_id),
+            item = ImportTransaction(
+                transaction_id=None,  # numbered in one block by bulk_insert_transactions
                 date=t.date,
                 description=t.payee or t.details or "",
                 transaction_type=t.type,
                 posted_at=datetime.combine(t.date, datetime.min.time()),
             )
-            db.session.add(txn)
-            db.session.flush()
-            imported_txn_ids.append(int(txn.id))
+            if earliest_date is None or t.date < earliest_date:
+                earliest_date = t.date
 
-            # Create mapped lines
+            # Mapped lines
             for ln in getattr(t, "lines", []) or []:
                 acct_id = mappings[ln.csv_account_name]
-                db.session.add(
-                    TransactionLine(
-                        transaction_id=txn.id,
+                touched_account_ids.add(int(acct_id))
+                item.lines.append(
+                    ImportLine(
                         account_id=acct_id,
                         is_debit=ln.is_debit,
                         amount=float(ln.amount),
@@ -435,9 +447,9 @@ def import_csv():
                     flash(f"Counter account cannot be the same as the mapped asset account for TRN_NO {trn_no}.", "error")
                 else:
                     ref_ln = t.lines[0]
-                    db.session.add(
-                        TransactionLine(
-                            transaction_id=txn.id,
+                    touched_account_ids.add(counter_account_id)
+                    item.lines.append(
+                        ImportLine(
                             account_id=counter_account_id,
                             is_debit=(not ref_ln.is_debit),
                             amount=float(ref_ln.amount),
@@ -445,20 +457,20 @@ def import_csv():
                         )
                     )
 
-            # Remember imported fingerprint
+            # Not inserted yet: index it under a placeholder id (only its presence matters here)
+            for ln in item.lines:
+                match_index.add(t.date, ln.amount, -(len(pending) + 1), item.description)
+
+            # Fingerprint to remember once the row has its id
+            fp = None
             if getattr(t, "lines", None):
                 asset_csv_acct = t.lines[0].csv_account_name
                 asset_acct_id = mappings.get(asset_csv_acct)
                 if asset_acct_id:
                     fp = _csv_fingerprint_for_txn(t, int(asset_acct_id))
-                    _upsert_review(
-                        entity_id=entity_id,
-                        fingerprint=fp,
-                        status="imported",
-                        linked_transaction_id=int(txn.id),
-                    )
 
-            imported += 1
+            pending.append(item)
+            pending_fingerprints.append(fp)
 
         if blocked_for_review:
             db.session.rollback()
@@ -467,12 +479,29 @@ def import_csv():
                 f"Please review and tick 'Confirm' for: {', '.join(str(x) for x in blocked_for_review)}",
                 "error",
             )
-            return redirect(url_for("transactions_ui.import_csv", csv_path=csv_path, start_date=start_date_str, show_mappings="1"))
+            return redirect(url_for("transactions_ui.import_csv", import_id=import_id, start_date=start_date_str, show_mappings="1"))
+
+        imported_txn_ids = bulk_insert_transactions(entity_id, pending)
+        imported = len(imported_txn_ids)
+        update_payee_index(entity_id, imported_txn_ids)
+
+        for txn_pk, fp in zip(imported_txn_ids, pending_fingerprints):
+            if fp:
+                _upsert_review(
+                    entity_id=entity_id,
+                    fingerprint=fp,
+                    status="imported",
+                    linked_transaction_id=int(txn_pk),
+                )
+
+        db.session.flush()
+        refresh_account_balances(entity_id, touched_account_ids, earliest_date)
+        bump_ledger_version(entity_id)
 
         db.session.commit()
         session["csv_last_imported_ids"] = imported_txn_ids
         flash(f"Imported {imported} transaction(s).", "success")
-        return redirect(url_for("transactions_ui.import_csv", csv_path=csv_path, start_date=start_date_str, show_mappings="1"))
+        return redirect(url_for("transactions_ui.import_csv", import_id=import_id, start_date=start_date_str, show_mappings="1"))
 
     # ------------------------------
     # Build preview list (only mapped asset accounts)
@@ -545,24 +574,9 @@ def import_csv():
     # ------------------------------
     possible_matches: Dict[int, List[dict]] = {}
     if txns:
-        tol = 0.005
+        match_index = load_date_amount_index(entity_id, (t.date for t in txns))
         for t in txns:
-            amt = float(t.total_abs or 0)
-            if amt <= 0:
-                possible_matches[int(t.trn_no)] = []
-                continue
-
-            candidates = (
-                db.session.query(Transaction)
-                .options(load_only(Transaction.id, Transaction.description, Transaction.date))
-                .join(TransactionLine)
-                .filter(Transaction.entity_id == entity_id)
-                .filter(Transaction.date == t.date)
-                .filter(TransactionLine.amount.between(amt - tol, amt + tol))
-                .distinct()
-                .all()
-            )
-            possible_matches[int(t.trn_no)] = [{"id": int(c.id), "description": (c.description or "")} for c in candidates]
+            possible_matches[int(t.trn_no)] = match_index.matches(t.date, float(t.total_abs or 0))
 
     # Enrich match candidates with "other side" account names.
     # Template expects `asset_account` field, but we show the counterparty account(s) instead.
@@ -663,7 +677,7 @@ def import_csv():
     # Suggest likely counterparty account (historical heuristic)
     # ------------------------------
     suggestions: Dict[int, Optional[dict]] = {}
-    if csv_path and preview_txns:
+    if import_id and preview_txns:
         term_for_trn: Dict[int, str] = {}
         unique_terms: Dict[str, Optional[dict]] = {}
 
@@ -675,33 +689,7 @@ def import_csv():
             term_for_trn[int(t.trn_no)] = term
             unique_terms.setdefault(term, None)
 
-        non_asset_accounts_sq = (
-            db.session.query(Account.id)
-            .filter(Account.entity_id == entity_id)
-            .filter(~Account.type.in_(ASSET_TYPES))
-            .subquery()
-        )
-
-        for term in tuple(unique_terms.keys()):
-            res = (
-                db.session.query(
-                    Account.id.label("id"),
-                    Account.name.label("name"),
-                    func.count(TransactionLine.id).label("cnt"),
-                )
-                .select_from(Transaction)
-                .join(TransactionLine, TransactionLine.transaction_id == Transaction.id)
-                .join(Account, Account.id == TransactionLine.account_id)
-                .filter(Transaction.entity_id == entity_id)
-                .filter(Transaction.description.ilike(f"%{term}%"))
-                .filter(Account.id.in_(select(non_asset_accounts_sq.c.id)))
-                .group_by(Account.id, Account.name)
-                .order_by(func.count(TransactionLine.id).desc())
-                .limit(1)
-                .first()
-            )
-            if res:
-                unique_terms[term] = {"account_id": int(res.id), "account_name": res.name, "count": int(res.cnt)}
+        unique_terms.update(suggest_accounts(entity_id, unique_terms.keys()))
 
         for trn_no, term in term_for_trn.items():
             suggestions[trn_no] = unique_terms.get(term)
@@ -772,7 +760,8 @@ def import_csv():
 
     return render_template(
         "transactions/import.html",
-        csv_path=csv_path,
+        import_id=import_id,
+        csv_name=imp.csv_name if imp else "",
         start_date=start_date_str,
         rows=preview_rows,
         missing_mappings=missing_mappings,
@@ -1,22 +1,43 @@
 from decimal import Decimal, ROUND_HALF_UP
 
 
-def money(value):
+def to_cents(value):
     """
-    Normalize a numeric value to a 2‑decimal float suitable for display
-    and JSON serialization.
+    Convert a money value (None, int, float, Decimal or numeric str) to integer
+    cents, rounding half up. Amounts are stored and summed as cents; convert at
+    the edge, once per input value.
+    """
+
+    if value is None or value == "":
+        return 0
+
+    if isinstance(value, str):
+        # Accept what people type: "$1,234.56"
+        value = value.replace(",", "").replace("$", "").strip()
+
+    return int(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
 
-    - Accepts None, int, float, Decimal
-    - Returns float rounded to 2 decimal places
+
+def parse_cents(value):
+    """
+    Like to_cents, but returns None for blank or non-numeric input (search boxes).
     """
 
-    if value is None:
-        return 0.0
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
 
-    # Convert to Decimal for safe rounding
-    amount = Decimal(str(value)).quantize(
-        Decimal("0.01"),
-        rounding=ROUND_HALF_UP
-    )
+    try:
+        return to_cents(value)
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+
+
+def from_cents(cents):
+    """
+    Integer cents (e.g. a SQL SUM) -> float dollars for display and JSON.
+    """
+
+    if cents is None:
+        return 0.0
 
-    return float(amount)
+    return int(cents) / 100
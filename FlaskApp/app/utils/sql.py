@@ -0,0 +1,53 @@
+# SQL expressions that differ between SQLite and PostgreSQL, compiled per dialect.
+from sqlalchemy import String
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class distinct_string_agg(GenericFunction):
+    """
+    Distinct non-null values of a string expression joined with `separator`
+    (order unspecified), e.g. distinct_string_agg(Account.name) -> "Bank,Fuel".
+
+      SQLite:      group_concat(DISTINCT expr)   (separator is always ",")
+      PostgreSQL:  string_agg(DISTINCT expr, ',')
+      MySQL:       group_concat(DISTINCT expr SEPARATOR ',')
+    """
+    type = String()
+    inherit_cache = True
+    _traverse_internals = GenericFunction._traverse_internals + [
+        ("separator", InternalTraversal.dp_string),
+    ]
+
+    def __init__(self, expr, separator=",", **kw):
+        self.separator = separator
+        super().__init__(expr, **kw)
+
+
+@compiles(distinct_string_agg)
+def _distinct_string_agg_default(element, compiler, **kw):
+    raise CompileError(f"distinct_string_agg is not supported on the {compiler.dialect.name} dialect")
+
+
+@compiles(distinct_string_agg, "sqlite")
+def _distinct_string_agg_sqlite(element, compiler, **kw):
+    # SQLite only allows DISTINCT on single-argument aggregates
+    if element.separator != ",":
+        raise CompileError(
+            f"distinct_string_agg: SQLite only supports the ',' separator, got {element.separator!r}"
+        )
+    return f"group_concat(DISTINCT {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(distinct_string_agg, "postgresql")
+def _distinct_string_agg_postgresql(element, compiler, **kw):
+    sep = compiler.render_literal_value(element.separator, String())
+    return f"string_agg(DISTINCT {compiler.process(element.clauses, **kw)}, {sep})"
+
+
+@compiles(distinct_string_agg, "mysql")
+def _distinct_string_agg_mysql(element, compiler, **kw):
+    sep = compiler.render_literal_value(element.separator, String())
+    return f"group_concat(DISTINCT {compiler.process(element.clauses, **kw)} SEPARATOR {sep})"
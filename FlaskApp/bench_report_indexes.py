@@ -0,0 +1,174 @@
+# Benchmark for the report/ledger composite indexes (migration 5b8e2c4d7f10).
+#
+# Builds a throwaway SQLite database with the same table shapes as the app, runs the
+# query shapes used by pnl_report, balance_sheet_report, account_list and
+# account_ledger, and prints EXPLAIN QUERY PLAN + timings before and after the indexes
+# are created. Needs only the standard library:
+#
+#   python FlaskApp/bench_report_indexes.py [n_transactions]
+#
+# Expected: "SCAN transaction_lines" / "SCAN transactions" before, and
+# "SEARCH ... USING [COVERING] INDEX ix_..." after.
+
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+SCHEMA = """
+CREATE TABLE entities (id INTEGER PRIMARY KEY, name VARCHAR(150) NOT NULL, type VARCHAR(50));
+CREATE TABLE accounts (
+    id INTEGER PRIMARY KEY, entity_id INTEGER NOT NULL REFERENCES entities(id),
+    name VARCHAR(100) NOT NULL, type VARCHAR(50) NOT NULL, description VARCHAR(100)
+);
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY, entity_id INTEGER NOT NULL REFERENCES entities(id),
+    transaction_id INTEGER NOT NULL, date DATE NOT NULL, description TEXT,
+    created_at DATETIME NOT NULL, posted_at DATETIME NOT NULL
+);
+CREATE INDEX ix_transactions_date ON transactions (date);
+CREATE INDEX ix_transactions_transaction_id ON transactions (transaction_id);
+CREATE TABLE transaction_lines (
+    id INTEGER PRIMARY KEY, transaction_id INTEGER NOT NULL REFERENCES transactions(id),
+    account_id INTEGER NOT NULL REFERENCES accounts(id), is_debit BOOLEAN NOT NULL,
+    amount_cents BIGINT NOT NULL, memo TEXT
+);
+"""
+
+INDEXES = """
+CREATE INDEX ix_transactions_entity_date_id ON transactions (entity_id, date, id);
+CREATE INDEX ix_transaction_lines_account_txn_covering ON transaction_lines (account_id, transaction_id, is_debit, amount_cents);
+CREATE INDEX ix_transaction_lines_transaction_id ON transaction_lines (transaction_id);
+CREATE INDEX ix_accounts_entity_type ON accounts (entity_id, type);
+"""
+
+PNL_TYPES = ("Income", "Other Income", "Cost of Goods Sold", "Expenses", "Other Expense")
+BS_TYPES = ("Bank", "Accounts Receivable", "Credit Card", "Equity")
+
+QUERIES = {
+    "pnl period (pnl_report)": (
+        """
+        SELECT accounts.type, accounts.name,
+               sum(CASE WHEN transaction_lines.is_debit IS 1 THEN transaction_lines.amount_cents
+                        ELSE -transaction_lines.amount_cents END)
+        FROM accounts
+        JOIN transaction_lines ON transaction_lines.account_id = accounts.id
+        JOIN transactions ON transactions.id = transaction_lines.transaction_id
+        WHERE accounts.entity_id = :entity_id AND transactions.entity_id = :entity_id
+          AND accounts.type IN ('Income', 'Other Income', 'Cost of Goods Sold', 'Expenses', 'Other Expense')
+          AND transactions.date >= :start AND transactions.date <= :end
+        GROUP BY accounts.type, accounts.name
+        """
+    ),
+    "as-of balances (balance_sheet_report)": (
+        """
+        SELECT accounts.type, accounts.name,
+               sum(CASE WHEN transaction_lines.is_debit IS 1 THEN transaction_lines.amount_cents
+                        ELSE -transaction_lines.amount_cents END)
+        FROM accounts
+        JOIN transaction_lines ON transaction_lines.account_id = accounts.id
+        JOIN transactions ON transactions.id = transaction_lines.transaction_id
+        WHERE accounts.entity_id = :entity_id AND transactions.entity_id = :entity_id
+          AND accounts.type IN ('Bank', 'Accounts Receivable', 'Credit Card', 'Equity')
+          AND transactions.date <= :end
+        GROUP BY accounts.type, accounts.name
+        """
+    ),
+    "account totals (account_list)": (
+        """
+        SELECT accounts.id, accounts.name,
+               sum(CASE WHEN transaction_lines.is_debit = 1 THEN transaction_lines.amount_cents ELSE 0 END),
+               sum(CASE WHEN transaction_lines.is_debit = 0 THEN transaction_lines.amount_cents ELSE 0 END)
+        FROM accounts
+        LEFT OUTER JOIN transaction_lines ON transaction_lines.account_id = accounts.id
+        WHERE accounts.entity_id = :entity_id
+        GROUP BY accounts.id
+        """
+    ),
+    "account ledger (account_ledger)": (
+        """
+        SELECT transactions.date, transactions.transaction_id, transactions.description,
+               transactions.id, transaction_lines.is_debit, transaction_lines.amount_cents
+        FROM transaction_lines
+        JOIN transactions ON transaction_lines.transaction_id = transactions.id
+        WHERE transaction_lines.account_id = :account_id
+        ORDER BY transactions.date, transactions.id
+        """
+    ),
+    "transaction lines (transaction_detail)": (
+        """
+        SELECT transaction_lines.id, transaction_lines.account_id, transaction_lines.amount_cents
+        FROM transaction_lines
+        WHERE transaction_lines.transaction_id = :txn_id
+        ORDER BY transaction_lines.id
+        """
+    ),
+}
+
+
+def populate(conn: sqlite3.Connection, n_txn: int) -> None:
+    rnd = random.Random(42)
+    conn.executemany("INSERT INTO entities (id, name, type) VALUES (?, ?, ?)", [(1, "E1", "company"), (2, "E2", "trust")])
+
+    accounts = []
+    acct_id = 0
+    for entity_id in (1, 2):
+        for acct_type in PNL_TYPES + BS_TYPES:
+            for i in range(10):
+                acct_id += 1
+                accounts.append((acct_id, entity_id, f"{acct_type}:{entity_id}:{i}", acct_type))
+    conn.executemany("INSERT INTO accounts (id, entity_id, name, type) VALUES (?, ?, ?, ?)", accounts)
+    by_entity = {e: [a[0] for a in accounts if a[1] == e] for e in (1, 2)}
+
+    start = date(2015, 1, 1)
+    txns, lines = [], []
+    for txn_pk in range(1, n_txn + 1):
+        entity_id = 1 + (txn_pk % 2)
+        d = (start + timedelta(days=rnd.randint(0, 3650))).isoformat()
+        txns.append((txn_pk, entity_id, txn_pk, d, f"txn {txn_pk}", d, d))
+        a1, a2 = rnd.sample(by_entity[entity_id], 2)
+        amt = rnd.randint(100, 500_000)  # cents
+        lines.append((txn_pk, a1, 1, amt))
+        lines.append((txn_pk, a2, 0, amt))
+    conn.executemany(
+        "INSERT INTO transactions (id, entity_id, transaction_id, date, description, created_at, posted_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        txns,
+    )
+    conn.executemany(
+        "INSERT INTO transaction_lines (transaction_id, account_id, is_debit, amount_cents) VALUES (?, ?, ?, ?)",
+        lines,
+    )
+    conn.commit()
+
+
+def run(conn: sqlite3.Connection, label: str) -> None:
+    params = {"entity_id": 1, "start": "2020-07-01", "end": "2021-06-30", "account_id": 1, "txn_id": 1234}
+    print(f"\n===== {label} =====")
+    for name, sql in QUERIES.items():
+        plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        t0 = time.perf_counter()
+        for _ in range(5):
+            conn.execute(sql, params).fetchall()
+        elapsed_ms = (time.perf_counter() - t0) / 5 * 1000
+        print(f"\n-- {name}: {elapsed_ms:.2f} ms")
+        for row in plan:
+            print(f"   {row[-1]}")
+
+
+def main() -> None:
+    n_txn = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    populate(conn, n_txn)
+    conn.execute("ANALYZE")
+
+    run(conn, f"before indexes ({n_txn} transactions)")
+    conn.executescript(INDEXES)
+    conn.execute("ANALYZE")
+    run(conn, "after indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# FlaskApp/tests/conftest.py
+# Run from the repository root: python -m pytest FlaskApp/tests
+
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before FlaskApp.app is imported
+_DB_DIR = tempfile.mkdtemp(prefix="accounting-tests-")
+_DB_PATH = os.path.join(_DB_DIR, "accounting.db")
+open(_DB_PATH, "a").close()  # __init__ prints the file's permissions
+os.environ.setdefault("FLASK_SQLALCHEMY_DATABASE_URI", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("FLASK_SECRET_KEY", "tests")
+
+
+@pytest.fixture
+def app():
+    from FlaskApp.app import app as flask_app
+    from FlaskApp.app.accounting_db import db
+
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,87 @@
+# FlaskApp/tests/test_sql_dialects.py
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import mssql, mysql, postgresql, sqlite
+from sqlalchemy.exc import CompileError
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.account import Account
+from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.models.transaction import Transaction
+from FlaskApp.app.services.transaction_list import encode_cursor, transaction_list_query
+from FlaskApp.app.services.transaction_numbers import allocate_transaction_numbers
+from FlaskApp.app.utils.sql import distinct_string_agg
+
+
+def _sql(stmt, dialect):
+    return str(stmt.compile(dialect=dialect)).replace("\n", " ")
+
+
+def test_distinct_string_agg_sqlite():
+    sql = _sql(select(distinct_string_agg(Account.name)), sqlite.dialect())
+    assert "group_concat(DISTINCT accounts.name)" in sql
+
+
+def test_distinct_string_agg_postgresql():
+    sql = _sql(select(distinct_string_agg(Account.name)), postgresql.dialect())
+    assert "string_agg(DISTINCT accounts.name, ',')" in sql
+
+
+def test_distinct_string_agg_separator():
+    stmt = select(distinct_string_agg(Account.name, separator="; "))
+    assert "string_agg(DISTINCT accounts.name, '; ')" in _sql(stmt, postgresql.dialect())
+    assert "group_concat(DISTINCT accounts.name SEPARATOR '; ')" in _sql(stmt, mysql.dialect())
+    with pytest.raises(CompileError):
+        _sql(stmt, sqlite.dialect())
+
+
+def test_distinct_string_agg_unsupported_dialect():
+    with pytest.raises(CompileError, match="mssql"):
+        _sql(select(distinct_string_agg(Account.name)), mssql.dialect())
+
+
+def test_transaction_list_query_compiles_per_dialect(app):
+    row = Transaction(id=7, date=date(2025, 1, 5))
+    row.created_at = datetime(2025, 1, 5, 10, 0, 0, 123456)
+    query = transaction_list_query(
+        entity_id=1, status="posted", account_id=2, limit=51, cursor=encode_cursor(row)
+    )
+
+    sqlite_sql = _sql(query.statement, sqlite.dialect())
+    assert "group_concat(DISTINCT accounts.name)" in sqlite_sql
+    assert "string_agg" not in sqlite_sql
+
+    pg_sql = _sql(query.statement, postgresql.dialect())
+    assert "string_agg(DISTINCT accounts.name, ',')" in pg_sql
+    assert "group_concat" not in pg_sql
+    assert "(transactions.date, transactions.created_at, transactions.id) <" in pg_sql
+
+
+def test_transaction_number_start_has_no_cast(app):
+    entity = Entity(name="Numbers Pty Ltd", type="company")
+    db.session.add(entity)
+    db.session.flush()
+    db.session.add(
+        Transaction(entity_id=entity.id, transaction_id=41, date=date(2025, 1, 5))
+    )
+    db.session.flush()
+
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _capture)
+    try:
+        first = allocate_transaction_numbers(entity.id, 2)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture)
+    db.session.rollback()
+
+    assert first == 42
+    start = [s for s in statements if "max(transactions.transaction_id)" in s]
+    assert start, statements
+    assert not any("CAST" in s.upper() for s in start)
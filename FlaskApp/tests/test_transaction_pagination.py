@@ -0,0 +1,57 @@
+# FlaskApp/tests/test_transaction_pagination.py
+
+import importlib.util
+import os
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from FlaskApp.app.accounting_db import db
+from FlaskApp.app.models.entity import Entity
+from FlaskApp.app.services.transaction_list import get_transaction_page
+
+MIGRATION = os.path.join(
+    os.path.dirname(__file__), "..", "..", "migrations", "versions",
+    "c6e8a0b2d4f7_normalize_legacy_datetime_format.py",
+)
+
+
+def _run_migration(path):
+    spec = importlib.util.spec_from_file_location("normalize_legacy_datetime_format", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with db.engine.begin() as conn:
+        migration.op = Operations(MigrationContext.configure(conn))
+        migration.upgrade()
+
+
+def _all_pages(entity_id, page_size):
+    seen, cursor = [], None
+    for _ in range(20):
+        rows, cursor = get_transaction_page(page_size, cursor=cursor, entity_id=entity_id)
+        seen.extend(r.id for r in rows)
+        if not cursor:
+            break
+    return seen
+
+
+def test_pagination_with_legacy_created_at(app):
+    entity = Entity(name="Legacy Pty Ltd", type="company")
+    db.session.add(entity)
+    db.session.flush()
+
+    # Rows as left by migration 812c0a66cc61: CURRENT_TIMESTAMP, no microseconds
+    for pk in range(1, 11):
+        db.session.execute(
+            text(
+                "INSERT INTO transactions (id, entity_id, transaction_id, date, description, created_at, posted_at) "
+                "VALUES (:pk, :entity_id, :pk, '2025-01-05', 'legacy', '2025-01-05 10:00:00', '2025-01-05 10:00:00')"
+            ),
+            {"pk": pk, "entity_id": entity.id},
+        )
+    db.session.commit()
+
+    _run_migration(MIGRATION)
+
+    assert _all_pages(entity.id, 3) == list(range(10, 0, -1))
@@ -0,0 +1,87 @@
+"""create transaction_search FTS5 index
+
+Revision ID: 2f6c8d1a7e93
+Revises: 9e4b6a2f3c58
+Create Date: 2026-10-18 13:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "2f6c8d1a7e93"
+down_revision = "9e4b6a2f3c58"
+branch_labels = None
+depends_on = None
+
+
+# All memos of a transaction, space separated
+_MEMOS = "coalesce((SELECT group_concat(memo, ' ') FROM transaction_lines WHERE transaction_id = {txn}), '')"
+
+TRIGGERS = {
+    "transaction_search_txn_ai": f"""
+        CREATE TRIGGER transaction_search_txn_ai AFTER INSERT ON transactions BEGIN
+            INSERT OR REPLACE INTO transaction_search (rowid, description, memos)
+            VALUES (new.id, coalesce(new.description, ''), {_MEMOS.format(txn="new.id")});
+        END
+    """,
+    "transaction_search_txn_au": """
+        CREATE TRIGGER transaction_search_txn_au AFTER UPDATE OF description ON transactions BEGIN
+            UPDATE transaction_search SET description = coalesce(new.description, '') WHERE rowid = new.id;
+        END
+    """,
+    "transaction_search_txn_ad": """
+        CREATE TRIGGER transaction_search_txn_ad AFTER DELETE ON transactions BEGIN
+            DELETE FROM transaction_search WHERE rowid = old.id;
+        END
+    """,
+    "transaction_search_line_ai": f"""
+        CREATE TRIGGER transaction_search_line_ai AFTER INSERT ON transaction_lines
+        WHEN new.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_au": f"""
+        CREATE TRIGGER transaction_search_line_au AFTER UPDATE OF memo, transaction_id ON transaction_lines BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_ad": f"""
+        CREATE TRIGGER transaction_search_line_ad AFTER DELETE ON transaction_lines
+        WHEN old.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+        END
+    """,
+}
+
+
+def upgrade():
+    # FTS5 is SQLite-only; elsewhere services.transaction_search falls back to ILIKE
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("CREATE VIRTUAL TABLE transaction_search USING fts5(description, memos, tokenize = 'unicode61 remove_diacritics 2')")
+    for ddl in TRIGGERS.values():
+        op.execute(ddl)
+
+    op.execute(f"""
+        INSERT INTO transaction_search (rowid, description, memos)
+        SELECT t.id, coalesce(t.description, ''), {_MEMOS.format(txn="t.id")}
+        FROM transactions t
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.execute("DROP TABLE IF EXISTS transaction_search")
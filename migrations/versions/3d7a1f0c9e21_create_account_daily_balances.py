@@ -0,0 +1,49 @@
+"""create account daily balances
+
+Revision ID: 3d7a1f0c9e21
+Revises: e62fea850d0a, fb8e792038e6
+Create Date: 2026-10-18 09:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3d7a1f0c9e21"
+down_revision = ("e62fea850d0a", "fb8e792038e6")
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "account_daily_balances",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity_id", sa.Integer(), sa.ForeignKey("entities.id"), nullable=False),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("balance", sa.Float(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("entity_id", "account_id", "date", name="uq_entity_account_date_balance"),
+    )
+
+    # Backfill: cumulative (debit - credit) per account at the end of each day with activity
+    op.execute("""
+        INSERT INTO account_daily_balances (entity_id, account_id, date, balance)
+        SELECT entity_id, account_id, date,
+               SUM(net_activity) OVER (PARTITION BY entity_id, account_id ORDER BY date)
+        FROM (
+            SELECT t.entity_id AS entity_id,
+                   l.account_id AS account_id,
+                   t.date AS date,
+                   SUM(CASE WHEN l.is_debit THEN l.amount ELSE -l.amount END) AS net_activity
+            FROM transaction_lines l
+            JOIN transactions t ON t.id = l.transaction_id
+            GROUP BY t.entity_id, l.account_id, t.date
+        ) AS daily
+    """)
+
+
+def downgrade():
+    op.drop_table("account_daily_balances")
@@ -0,0 +1,131 @@
+"""store amounts as integer cents
+
+Revision ID: 4a7f1e9c2d60
+Revises: 2f6c8d1a7e93
+Create Date: 2026-10-18 14:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4a7f1e9c2d60"
+down_revision = "2f6c8d1a7e93"
+branch_labels = None
+depends_on = None
+
+
+# SQLite batch mode rebuilds transaction_lines (copy, drop, rename). Its triggers are
+# dropped with it, and the rename fails while transaction_search_txn_ai still refers
+# to the table, so the transaction_search triggers from 2f6c8d1a7e93 are dropped
+# first and recreated afterwards.
+_MEMOS = "coalesce((SELECT group_concat(memo, ' ') FROM transaction_lines WHERE transaction_id = {txn}), '')"
+
+TRIGGERS = {
+    "transaction_search_txn_ai": f"""
+        CREATE TRIGGER transaction_search_txn_ai AFTER INSERT ON transactions BEGIN
+            INSERT OR REPLACE INTO transaction_search (rowid, description, memos)
+            VALUES (new.id, coalesce(new.description, ''), {_MEMOS.format(txn="new.id")});
+        END
+    """,
+    "transaction_search_txn_au": """
+        CREATE TRIGGER transaction_search_txn_au AFTER UPDATE OF description ON transactions BEGIN
+            UPDATE transaction_search SET description = coalesce(new.description, '') WHERE rowid = new.id;
+        END
+    """,
+    "transaction_search_txn_ad": """
+        CREATE TRIGGER transaction_search_txn_ad AFTER DELETE ON transactions BEGIN
+            DELETE FROM transaction_search WHERE rowid = old.id;
+        END
+    """,
+    "transaction_search_line_ai": f"""
+        CREATE TRIGGER transaction_search_line_ai AFTER INSERT ON transaction_lines
+        WHEN new.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_au": f"""
+        CREATE TRIGGER transaction_search_line_au AFTER UPDATE OF memo, transaction_id ON transaction_lines BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="new.transaction_id")}
+            WHERE rowid = new.transaction_id;
+        END
+    """,
+    "transaction_search_line_ad": f"""
+        CREATE TRIGGER transaction_search_line_ad AFTER DELETE ON transaction_lines
+        WHEN old.memo IS NOT NULL BEGIN
+            UPDATE transaction_search SET memos = {_MEMOS.format(txn="old.transaction_id")}
+            WHERE rowid = old.transaction_id;
+        END
+    """,
+}
+
+
+def _is_sqlite():
+    return op.get_bind().dialect.name == "sqlite"
+
+
+def _drop_search_triggers():
+    if _is_sqlite():
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def _create_search_triggers():
+    if _is_sqlite():
+        for ddl in TRIGGERS.values():
+            op.execute(ddl)
+
+
+def upgrade():
+    _drop_search_triggers()
+
+    with op.batch_alter_table("transaction_lines", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("amount_cents", sa.BigInteger(), nullable=True))
+    op.execute("UPDATE transaction_lines SET amount_cents = CAST(ROUND(amount * 100) AS INTEGER)")
+
+    with op.batch_alter_table("transaction_lines", schema=None) as batch_op:
+        batch_op.drop_index("ix_transaction_lines_account_txn_covering")
+        batch_op.alter_column("amount_cents", existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_column("amount")
+        batch_op.create_index(
+            "ix_transaction_lines_account_txn_covering",
+            ["account_id", "transaction_id", "is_debit", "amount_cents"],
+            unique=False,
+        )
+    _create_search_triggers()
+
+    with op.batch_alter_table("account_daily_balances", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("balance_cents", sa.BigInteger(), nullable=False, server_default="0"))
+    op.execute("UPDATE account_daily_balances SET balance_cents = CAST(ROUND(balance * 100) AS INTEGER)")
+    with op.batch_alter_table("account_daily_balances", schema=None) as batch_op:
+        batch_op.drop_column("balance")
+
+
+def downgrade():
+    _drop_search_triggers()
+
+    with op.batch_alter_table("account_daily_balances", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("balance", sa.Float(), nullable=False, server_default="0"))
+    op.execute("UPDATE account_daily_balances SET balance = balance_cents / 100.0")
+    with op.batch_alter_table("account_daily_balances", schema=None) as batch_op:
+        batch_op.drop_column("balance_cents")
+
+    with op.batch_alter_table("transaction_lines", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("amount", sa.Float(), nullable=True))
+    op.execute("UPDATE transaction_lines SET amount = amount_cents / 100.0")
+
+    with op.batch_alter_table("transaction_lines", schema=None) as batch_op:
+        batch_op.drop_index("ix_transaction_lines_account_txn_covering")
+        batch_op.alter_column("amount", existing_type=sa.Float(), nullable=False)
+        batch_op.drop_column("amount_cents")
+        batch_op.create_index(
+            "ix_transaction_lines_account_txn_covering",
+            ["account_id", "transaction_id", "is_debit", "amount"],
+            unique=False,
+        )
+    _create_search_triggers()
@@ -0,0 +1,51 @@
+"""add report query indexes
+
+Revision ID: 5b8e2c4d7f10
+Revises: 3d7a1f0c9e21
+Create Date: 2026-10-18 10:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5b8e2c4d7f10"
+down_revision = "3d7a1f0c9e21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_transactions_entity_date_id",
+        "transactions",
+        ["entity_id", "date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transaction_lines_account_txn_covering",
+        "transaction_lines",
+        ["account_id", "transaction_id", "is_debit", "amount"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_transaction_lines_transaction_id",
+        "transaction_lines",
+        ["transaction_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_accounts_entity_type",
+        "accounts",
+        ["entity_id", "type"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_accounts_entity_type", table_name="accounts")
+    op.drop_index("ix_transaction_lines_transaction_id", table_name="transaction_lines")
+    op.drop_index("ix_transaction_lines_account_txn_covering", table_name="transaction_lines")
+    op.drop_index("ix_transactions_entity_date_id", table_name="transactions")
@@ -0,0 +1,30 @@
+"""add transaction_lines amount_cents index
+
+Revision ID: 6d3e8b5a9f12
+Revises: 4a7f1e9c2d60
+Create Date: 2026-10-18 15:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "6d3e8b5a9f12"
+down_revision = "4a7f1e9c2d60"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_transaction_lines_amount_cents",
+        "transaction_lines",
+        ["amount_cents", "transaction_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_transaction_lines_amount_cents", table_name="transaction_lines")
@@ -0,0 +1,29 @@
+"""add entity ledger_version
+
+Revision ID: 7c2d9e4a1b35
+Revises: 5b8e2c4d7f10
+Create Date: 2026-10-18 11:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7c2d9e4a1b35"
+down_revision = "5b8e2c4d7f10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("entities", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("ledger_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("entities", schema=None) as batch_op:
+        batch_op.drop_column("ledger_version")
@@ -0,0 +1,29 @@
+"""add entity accounts_version
+
+Revision ID: 8b1f4c7e2a90
+Revises: 6d3e8b5a9f12
+Create Date: 2026-10-18 16:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8b1f4c7e2a90"
+down_revision = "6d3e8b5a9f12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("entities", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("accounts_version", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("entities", schema=None) as batch_op:
+        batch_op.drop_column("accounts_version")
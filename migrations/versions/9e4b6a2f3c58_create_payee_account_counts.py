@@ -0,0 +1,63 @@
+"""create payee account counts
+
+Revision ID: 9e4b6a2f3c58
+Revises: 7c2d9e4a1b35
+Create Date: 2026-10-18 12:00:00
+
+"""
+
+import re
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9e4b6a2f3c58"
+down_revision = "7c2d9e4a1b35"
+branch_labels = None
+depends_on = None
+
+# Same normalization as services.payee_suggestions.payee_tokens
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text):
+    return {t for t in _TOKEN_RE.findall((text or "").lower()[:64]) if len(t) >= 2 and not t.isdigit()}
+
+
+def upgrade():
+    payee_account_counts = op.create_table(
+        "payee_account_counts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity_id", sa.Integer(), sa.ForeignKey("entities.id"), nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("account_id", sa.Integer(), sa.ForeignKey("accounts.id"), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("entity_id", "token", "account_id", name="uq_entity_token_account"),
+    )
+
+    # Backfill: lines per (entity, description token, account)
+    counts = Counter()
+    rows = op.get_bind().execute(sa.text("""
+        SELECT t.entity_id, t.description, l.account_id
+        FROM transaction_lines l
+        JOIN transactions t ON t.id = l.transaction_id
+    """))
+    for entity_id, description, account_id in rows:
+        for tok in _tokens(description):
+            counts[(entity_id, tok, account_id)] += 1
+
+    if counts:
+        op.bulk_insert(
+            payee_account_counts,
+            [
+                {"entity_id": e, "token": tok, "account_id": a, "count": n}
+                for (e, tok, a), n in counts.items()
+            ],
+        )
+
+
+def downgrade():
+    op.drop_table("payee_account_counts")
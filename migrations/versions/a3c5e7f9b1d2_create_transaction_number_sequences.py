@@ -0,0 +1,37 @@
+"""create transaction number sequences
+
+Revision ID: a3c5e7f9b1d2
+Revises: 8b1f4c7e2a90
+Create Date: 2026-10-18 17:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3c5e7f9b1d2"
+down_revision = "8b1f4c7e2a90"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "transaction_number_sequences",
+        sa.Column("entity_id", sa.Integer(), sa.ForeignKey("entities.id"), primary_key=True, autoincrement=False),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Continue every entity's numbering from its current highest transaction number
+    op.execute("""
+        INSERT INTO transaction_number_sequences (entity_id, last_value)
+        SELECT entity_id, MAX(transaction_id)
+        FROM transactions
+        GROUP BY entity_id
+    """)
+
+
+def downgrade():
+    op.drop_table("transaction_number_sequences")
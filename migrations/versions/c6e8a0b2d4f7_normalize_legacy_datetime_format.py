@@ -0,0 +1,42 @@
+"""normalize legacy datetime format
+
+Revision ID: c6e8a0b2d4f7
+Revises: a3c5e7f9b1d2
+Create Date: 2026-10-19 09:00:00
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c6e8a0b2d4f7"
+down_revision = "a3c5e7f9b1d2"
+branch_labels = None
+depends_on = None
+
+# Columns backfilled with CURRENT_TIMESTAMP ('YYYY-MM-DD HH:MM:SS') by 812c0a66cc61 and
+# fb8e792038e6. SQLite compares DATETIME values as text, so they must be in SQLAlchemy's
+# 'YYYY-MM-DD HH:MM:SS.ffffff' storage format for the transaction list keyset cursor
+# (date, created_at, id) to compare correctly.
+COLUMNS = {
+    "transactions": ("created_at", "updated_at", "posted_at"),
+    "transaction_lines": ("created_at", "updated_at"),
+}
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return  # native timestamp types elsewhere
+
+    for table, columns in COLUMNS.items():
+        for col in columns:
+            op.execute(
+                f"UPDATE {table} SET {col} = {col} || '.000000' "
+                f"WHERE length({col}) = 19 AND {col} LIKE '____-__-__ __:__:__'"
+            )
+
+
+def downgrade():
+    pass  # same values, only the text representation changed